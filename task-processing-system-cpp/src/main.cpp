@@ -79,6 +79,12 @@ OrchestratorConfig parseCommandLine(int argc, char* argv[]) {
             } else {
                 throw std::invalid_argument("--orchestrator-port requires a value");
             }
+        } else if (arg == "--unix-socket" || arg == "-u") {
+            if (i + 1 < argc) {
+                config.unix_socket_path = argv[++i];
+            } else {
+                throw std::invalid_argument("--unix-socket requires a path");
+            }
         } else if (arg == "--config" || arg == "-c") {
             if (i + 1 < argc) {
                 std::string config_file = argv[++i];
@@ -114,6 +120,7 @@ void printUsage(const char* program_name) {
     std::cout << "  -w, --workers NUM          Number of worker nodes (default: 3, max: 50)" << std::endl;
     std::cout << "  -t, --threads NUM          Threads per worker (default: 4, max: 32)" << std::endl;
     std::cout << "  -o, --orchestrator-port NUM Orchestrator port (default: 5000)" << std::endl;
+    std::cout << "  -u, --unix-socket PATH     Serve on a Unix domain socket instead of TCP" << std::endl;
     std::cout << "  -c, --config FILE          Configuration file (JSON)" << std::endl;
     std::cout << "  -h, --help                 Show this help message" << std::endl;
     std::cout << std::endl;
@@ -140,7 +147,11 @@ void printSystemInfo(const OrchestratorConfig& config) {
     std::cout << std::endl;
     
     std::cout << "API Endpoints (Required Only):" << std::endl;
-    std::cout << "  Orchestrator: http://localhost:" << config.orchestrator_port << std::endl;
+    if (config.unix_socket_path.empty()) {
+        std::cout << "  Orchestrator: http://localhost:" << config.orchestrator_port << std::endl;
+    } else {
+        std::cout << "  Orchestrator: unix:" << config.unix_socket_path << std::endl;
+    }
     std::cout << "    POST /task/create        - Create a new task" << std::endl;
     std::cout << "    GET /task/{id}           - Get task information" << std::endl;
     std::cout << "    POST /task/{id}/complete - Mark task as completed (ONLY way to complete)" << std::endl;
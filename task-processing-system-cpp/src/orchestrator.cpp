@@ -34,6 +34,7 @@ OrchestratorConfig OrchestratorConfig::from_json(const nlohmann::json& j) {
     if (j.contains("num_workers")) config.num_workers = j["num_workers"];
     if (j.contains("threads_per_worker")) config.threads_per_worker = j["threads_per_worker"];
     if (j.contains("orchestrator_port")) config.orchestrator_port = j["orchestrator_port"];
+    if (j.contains("unix_socket_path")) config.unix_socket_path = j["unix_socket_path"];
     return config;
 }
 
@@ -41,7 +42,8 @@ nlohmann::json OrchestratorConfig::to_json() const {
     return json{
         {"num_workers", num_workers},
         {"threads_per_worker", threads_per_worker},
-        {"orchestrator_port", orchestrator_port}
+        {"orchestrator_port", orchestrator_port},
+        {"unix_socket_path", unix_socket_path}
     };
 }
 
@@ -56,6 +58,9 @@ TaskOrchestrator::TaskOrchestrator(const OrchestratorConfig& config)
         workers_.emplace_back(
             std::make_unique<Worker>(i, config_.threads_per_worker)
         );
+        workers_.back()->setStatusListener([this](const std::string& task_id, TaskStatus status) {
+            publishTaskStatus(task_id, status);
+        });
     }
     
     system_stats_.total_workers = config_.num_workers;
@@ -95,6 +100,7 @@ void TaskOrchestrator::stop() {
     }
     
     running_ = false;
+    events_cv_.notify_all();  // Let open /events streams finish
     
     // Stop all workers
     for (auto& worker : workers_) {
@@ -115,6 +121,13 @@ void TaskOrchestrator::stop() {
 
 void TaskOrchestrator::runHttpServer() {
     try {
+        if (!config_.unix_socket_path.empty()) {
+            // Local benchmarking: skip the TCP loopback stack (port is ignored)
+            std::cout << "Starting Orchestrator HTTP server on " << config_.unix_socket_path << std::endl;
+            ::unlink(config_.unix_socket_path.c_str());
+            server_->set_address_family(AF_UNIX).listen(config_.unix_socket_path, 80);
+            return;
+        }
         std::cout << "Starting Orchestrator HTTP server on port " << config_.orchestrator_port << std::endl;
         server_->listen("0.0.0.0", config_.orchestrator_port);
     } catch (const std::exception& e) {
@@ -171,6 +184,53 @@ bool TaskOrchestrator::completeTask(const std::string& task_id) {
     return false;
 }
 
+void TaskOrchestrator::publishTaskStatus(const std::string& task_id, TaskStatus status) {
+    std::string event = "data: " + json{
+        {"task_id", task_id},
+        {"status", taskStatusToString(status)}
+    }.dump() + "\n\n";
+    
+    {
+        std::lock_guard<std::mutex> lock(events_mutex_);
+        recent_events_.push_back(std::move(event));
+        if (recent_events_.size() > MAX_RECENT_EVENTS) {
+            recent_events_.pop_front();
+        }
+        ++next_event_seq_;
+    }
+    events_cv_.notify_all();
+}
+
+bool TaskOrchestrator::isAwaitingResult(const Task& task) {
+    // PROCESSING is set when a worker picks the task up, before the result
+    return task.getStatus() == TaskStatus::PENDING ||
+           (task.getStatus() == TaskStatus::PROCESSING && task.getResult().empty());
+}
+
+std::unique_ptr<Task> TaskOrchestrator::waitForProcessing(const std::string& task_id,
+                                                          std::chrono::milliseconds timeout) {
+    auto deadline = std::chrono::steady_clock::now() + timeout;
+    std::unique_lock<std::mutex> lock(events_mutex_);
+    while (true) {
+        // Note the event count before looking, so an event published while
+        // we look wakes the wait below instead of being missed
+        uint64_t seen_seq = next_event_seq_;
+        lock.unlock();
+        auto task = getTask(task_id);
+        if (!task || !isAwaitingResult(*task)) {
+            return task;
+        }
+        lock.lock();
+        bool woken = events_cv_.wait_until(lock, deadline, [&] {
+            return next_event_seq_ != seen_seq || !running_;
+        });
+        if (!woken || !running_) {
+            lock.unlock();
+            return getTask(task_id);
+        }
+    }
+}
+
 SystemStats TaskOrchestrator::getSystemStats() {
     updateSystemStats();
     return system_stats_;
@@ -258,15 +318,100 @@ void TaskOrchestrator::setupRoutes() {
         }
         res.set_header("Content-Type", "application/json");
     });
+
+    // POST /task/create_batch - Create many tasks in one request: {"tasks": [...]}
+    // Each task is validated and distributed on its own; rejected ones are
+    // listed under "errors" by their index in the request
+    server_->Post("/task/create_batch", [this](const httplib::Request& req, httplib::Response& res) {
+        try {
+            json input = json::parse(req.body);
+            if (!input.contains("tasks") || !input["tasks"].is_array()) {
+                throw std::invalid_argument("Expected a \"tasks\" array");
+            }
+
+            json task_ids = json::array();
+            json errors = json::array();
+            const json& tasks = input["tasks"];
+            for (size_t i = 0; i < tasks.size(); ++i) {
+                try {
+                    task_ids.push_back(createTask(Task::from_json(tasks[i])));
+                } catch (const std::exception& e) {
+                    errors.push_back({{"index", i}, {"error", e.what()}});
+                }
+            }
+
+            json response = {
+                {"message", "Tasks created successfully"},
+                {"task_ids", task_ids},
+                {"errors", errors}
+            };
+
+            res.status = 200;
+            res.body = response.dump();
+
+        } catch (const std::invalid_argument& e) {
+            res.status = 400;
+            res.body = json{{"error", "Invalid input: " + std::string(e.what())}}.dump();
+        } catch (const std::exception& e) {
+            res.status = 500;
+            res.body = json{{"error", "Internal server error: " + std::string(e.what())}}.dump();
+        }
+        res.set_header("Content-Type", "application/json");
+    });
+
+    // POST /task/run_sync - Create a task, wait for it to be processed and
+    // complete it, all in one request; the body is the same as /task/create
+    server_->Post("/task/run_sync", [this](const httplib::Request& req, httplib::Response& res) {
+        try {
+            json input = json::parse(req.body);
+            std::string task_id = createTask(Task::from_json(input));
+            
+            auto task = waitForProcessing(task_id, std::chrono::seconds(RUN_SYNC_TIMEOUT_SECONDS));
+            if (task && task->getStatus() == TaskStatus::PROCESSING && completeTask(task_id)) {
+                res.status = 200;
+                res.body = json{
+                    {"message", "Task processed and completed"},
+                    {"task_id", task_id},
+                    {"status", "completed"},
+                    {"result", task->getResult()}
+                }.dump();
+            } else if (task && isAwaitingResult(*task)) {
+                res.status = 504;
+                res.body = json{
+                    {"error", "Timed out waiting for task to be processed"},
+                    {"task_id", task_id}
+                }.dump();
+            } else {
+                res.status = 400;
+                res.body = json{
+                    {"error", "Task processing failed"},
+                    {"task_id", task_id},
+                    {"reason", task ? task->getErrorMessage() : std::string("Task not found")}
+                }.dump();
+            }
+            
+        } catch (const std::invalid_argument& e) {
+            res.status = 400;
+            res.body = json{{"error", "Invalid input: " + std::string(e.what())}}.dump();
+        } catch (const std::exception& e) {
+            res.status = 500;
+            res.body = json{{"error", "Internal server error: " + std::string(e.what())}}.dump();
+        }
+        res.set_header("Content-Type", "application/json");
+    });
     
     // GET /task/{id} - Get task information
+    // (HEAD is routed here too: the status header alone, no JSON body)
     server_->Get(R"(/task/([^/]+))", [this](const httplib::Request& req, httplib::Response& res) {
         std::string task_id = req.matches[1];
         
         auto task = getTask(task_id);
         if (task) {
             res.status = 200;
-            res.body = task->to_json().dump();
+            res.set_header("X-Task-Status", taskStatusToString(task->getStatus()));
+            if (req.method != "HEAD") {
+                res.body = task->to_json().dump();
+            }
         } else {
             res.status = 404;
             res.body = json{{"error", "Task not found"}}.dump();
@@ -314,6 +459,45 @@ void TaskOrchestrator::setupRoutes() {
         res.set_header("Content-Type", "application/json");
     });
     
+    // GET /events - Server-sent events stream: one `data: {"task_id", "status"}`
+    // message per task that is processed or fails, from the time of connecting
+    server_->Get("/events", [this](const httplib::Request& , httplib::Response& res) {
+        uint64_t next_seq;
+        {
+            std::lock_guard<std::mutex> lock(events_mutex_);
+            next_seq = next_event_seq_;
+        }
+        
+        res.set_header("Cache-Control", "no-cache");
+        res.set_chunked_content_provider("text/event-stream",
+            [this, next_seq](size_t , httplib::DataSink& sink) mutable {
+                std::string chunk;
+                {
+                    std::unique_lock<std::mutex> lock(events_mutex_);
+                    events_cv_.wait_for(lock, std::chrono::seconds(1), [&] {
+                        return next_event_seq_ != next_seq || !running_.load();
+                    });
+                    if (!running_.load()) {
+                        lock.unlock();
+                        sink.done();
+                        return true;
+                    }
+                    
+                    // A reader that fell behind skips the events already dropped
+                    uint64_t first_seq = next_event_seq_ - recent_events_.size();
+                    for (uint64_t seq = std::max(next_seq, first_seq); seq < next_event_seq_; ++seq) {
+                        chunk += recent_events_[seq - first_seq];
+                    }
+                    next_seq = next_event_seq_;
+                }
+                
+                if (chunk.empty()) {
+                    chunk = ": keep-alive\n\n";  // Comment line; also detects closed clients
+                }
+                return sink.write(chunk.data(), chunk.size());
+            });
+    });
+    
     // GET /stats - Get system statistics
     server_->Get("/stats", [this](const httplib::Request& , httplib::Response& res) {
         SystemStats stats = getSystemStats();
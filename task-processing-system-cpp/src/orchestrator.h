@@ -18,6 +18,7 @@
 #include <queue>
 #include <mutex>
 #include <condition_variable>
+#include <deque>
 
 // Forward declaration for HTTP server
 namespace httplib {
@@ -49,6 +50,7 @@ struct OrchestratorConfig {
     int num_workers = 3;                   ///< Number of workers
     int threads_per_worker = 4;            ///< Threads per worker
     int orchestrator_port = 5000;          ///< Orchestrator API port
+    std::string unix_socket_path;          ///< Serve on this Unix socket instead of TCP (optional)
     
     /**
      * @brief Load configuration from JSON
@@ -81,6 +83,14 @@ private:
     // Priority queue for task distribution (orchestrator level)
     std::mutex queue_mutex_;                           ///< Mutex for pending tasks queue
     
+    // Task status events (GET /events), newest last
+    static constexpr size_t MAX_RECENT_EVENTS = 4096;  ///< Events kept for slow stream readers
+    std::mutex events_mutex_;                          ///< Protects the event log
+    std::condition_variable events_cv_;                ///< Signalled on every new event
+    std::deque<std::string> recent_events_;            ///< Serialized SSE messages
+    uint64_t next_event_seq_ = 0;                      ///< Sequence number of the next event
+    static constexpr int RUN_SYNC_TIMEOUT_SECONDS = 30; ///< POST /task/run_sync processing wait
+    
     /**
      * @brief Setup HTTP routes for orchestrator
      */
@@ -102,6 +112,28 @@ private:
      */
     void updateSystemStats();
     
+    /**
+     * @brief Record a task status change and wake the /events streams
+     * @param task_id Task identifier
+     * @param status New task status
+     */
+    void publishTaskStatus(const std::string& task_id, TaskStatus status);
+    
+    /**
+     * @brief Check if a task has neither a result nor a failure yet
+     * @param task Task to check
+     * @return true while the task is pending or mid-calculation
+     */
+    static bool isAwaitingResult(const Task& task);
+    
+    /**
+     * @brief Wait until a task has a result or has failed, woken by status events
+     * @param task_id Task identifier
+     * @param timeout Longest time to wait
+     * @return Latest copy of the task (still awaiting its result on timeout), nullptr if not found
+     */
+    std::unique_ptr<Task> waitForProcessing(const std::string& task_id, std::chrono::milliseconds timeout);
+    
     /**
      * @brief Validate task input data
      * @param task Task to validate
@@ -89,6 +89,10 @@ void Worker::addTask(const Task& task) {
     queue_cv_.notify_one();
 }
 
+void Worker::setStatusListener(TaskStatusListener listener) {
+    status_listener_ = std::move(listener);
+}
+
 std::unique_ptr<Task> Worker::getTask(const std::string& task_id) {
     std::lock_guard<std::mutex> lock(storage_mutex_);
     auto it = task_storage_.find(task_id);
@@ -183,6 +187,10 @@ void Worker::processTask(Task& task) {
         
         stats_.tasks_processed++;
         
+        if (status_listener_) {
+            status_listener_(task.getId(), TaskStatus::PROCESSING);
+        }
+        
     } catch (const std::exception& e) {
         // Task failed during calculation
         task.setErrorMessage(e.what());
@@ -195,5 +203,9 @@ void Worker::processTask(Task& task) {
         
         stats_.tasks_failed++;
         stats_.tasks_processed++;
+        
+        if (status_listener_) {
+            status_listener_(task.getId(), TaskStatus::FAILED);
+        }
     }
 }
@@ -15,6 +15,7 @@
 #include <queue>
 #include <mutex>
 #include <condition_variable>
+#include <functional>
 #include <unordered_map>
 #include <iostream>
 
@@ -59,6 +60,11 @@ struct WorkerStats {
     nlohmann::json to_json() const;
 };
 
+/**
+ * @brief Callback told when a task has been processed or has failed
+ */
+using TaskStatusListener = std::function<void(const std::string& task_id, TaskStatus status)>;
+
 /**
  * @brief Worker node that processes tasks and provides HTTP API
  */
@@ -82,6 +88,8 @@ private:
     // Statistics
     WorkerStats stats_;                                ///< Worker statistics
     
+    TaskStatusListener status_listener_;               ///< Notified after processing (optional)
+    
     // HTTP Server (using cpp-httplib)
     std::unique_ptr<httplib::Server> server_;          ///< HTTP server instance
     
@@ -135,6 +143,12 @@ public:
      */
     void addTask(const Task& task);
     
+    /**
+     * @brief Set the listener notified when a task is processed or fails
+     * @param listener Callback, invoked on a processing thread (set before start())
+     */
+    void setStatusListener(TaskStatusListener listener);
+    
     /**
      * @brief Get task by ID
      * @param task_id Task identifier
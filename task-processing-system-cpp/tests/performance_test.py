@@ -9,324 +9,791 @@ import aiohttp
 import json
 import time
 import argparse
-import statistics
-import matplotlib.pyplot as plt
+import multiprocessing
 import numpy as np
-from concurrent.futures import ThreadPoolExecutor
-import subprocess
-import signal
 import os
 import sys
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import nullcontext
+from functools import lru_cache, partial
+
+try:
+    import orjson  # Optional fast JSON encoder
+except ImportError:
+    orjson = None
+
+try:
+    import uvloop  # Optional libuv-based event loop
+except ImportError:
+    uvloop = None
+
+try:
+    import httpx  # Optional shared HTTP client (preferred over aiohttp when present)
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # Lets httpx negotiate HTTP/2
+except ImportError:
+    h2 = None
+
+try:
+    import aiodns  # Optional c-ares resolver behind aiohttp.AsyncResolver
+except ImportError:
+    aiodns = None
+
+try:
+    import lttbc  # Optional C implementation of LTTB downsampling
+except ImportError:
+    lttbc = None
+
+if orjson is not None:
+    def json_dumps(value):
+        return orjson.dumps(value).decode()
+    json_dumpb = orjson.dumps
+    json_loads = orjson.loads
+else:
+    json_dumps = json.dumps
+    json_loads = json.loads  # Accepts bytes too
+    def json_dumpb(value):
+        return json.dumps(value).encode()
+
+PLOT_DPI = 150
+
+# Line/scatter series longer than this are downsampled before plotting
+PLOT_MAX_POINTS = 2000
+
+def lttb_indices(y, threshold=PLOT_MAX_POINTS):
+    """Indices (into y, with x = 0..n-1) of the `threshold` points kept by
+    Largest-Triangle-Three-Buckets downsampling; all of them if y is short"""
+    n = y.size
+    if n <= threshold or threshold < 3:
+        return np.arange(n)
+    if lttbc is not None:
+        x, _ = lttbc.downsample(np.arange(n, dtype=np.float64), y.astype(np.float64), threshold)
+        return x.astype(np.intp)
+    # First and last points are kept; the rest is split into threshold - 2
+    # buckets, each keeping the point forming the largest triangle with the
+    # previously kept point and the mean of the next bucket
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.intp)
+    keep = np.empty(threshold, dtype=np.intp)
+    keep[0], keep[-1] = 0, n - 1
+    a = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if bucket + 2 < edges.size:
+            next_lo, next_hi = hi, edges[bucket + 2]
+            cx, cy = (next_lo + next_hi - 1) / 2, y[next_lo:next_hi].mean()
+        else:
+            cx, cy = n - 1, y[n - 1]
+        area = np.abs((a - cx) * (y[lo:hi] - y[a]) - (a - np.arange(lo, hi)) * (cy - y[a]))
+        a = keep[bucket + 1] = lo + int(area.argmax())
+    return keep
+
+TERMINAL_OR_PROCESSED = ("processing", "completed", "failed")
+# In-flight task cap for a localhost target: about two per core, but never
+# below the 15 concurrent workflows the distribution test has always used
+DEFAULT_MAX_CONCURRENCY = max(15, 2 * (os.cpu_count() or 1))
+# Status polling backoff (without the /events stream): first poll after
+# POLL_INITIAL seconds, then each miss waits POLL_BACKOFF times longer
+POLL_INITIAL = 0.025
+POLL_MAX = 1.0
+POLL_BACKOFF = 1.5
+# /stats responses younger than this are reused (e.g. back-to-back final reads)
+STATS_TTL = 0.5
+
+PRIORITY_NAME = ("?", "LOW", "MEDIUM", "HIGH")  # Indexed by priority value
+OPERATIONS = ("factorial", "fibonacci", "prime_check")
+# Per-test inputs, one per entry of OPERATIONS (task i uses index i % 3)
+DISTRIBUTION_INPUTS = (5, 10, 15)
+LOAD_INPUTS = (8, 15, 1000)  # Varied complexity
+STABILITY_INPUTS = (10, 20, 1000)
+OPERATION_IDS = {operation: i for i, operation in enumerate(OPERATIONS)}
+JSON_HEADERS = {"Content-Type": "application/json"}
+CONNECT_ERRORS = (aiohttp.ClientConnectorError,) + ((httpx.ConnectError,) if httpx is not None else ())
+# Transient transport errors are retried: up to REQUEST_ATTEMPTS tries, waiting
+# RETRY_INITIAL seconds after the first failure and twice as long after each
+# further one (at most RETRY_MAX). A failed connect never reached the server, so
+# any method is retried; dropped connections and read timeouts may come after
+# the server applied the request, so only idempotent methods retry those
+RETRY_ERRORS = CONNECT_ERRORS
+IDEMPOTENT_RETRY_ERRORS = RETRY_ERRORS + (aiohttp.ServerDisconnectedError, asyncio.TimeoutError) + (
+    (httpx.ReadTimeout, httpx.RemoteProtocolError) if httpx is not None else ())
+IDEMPOTENT_METHODS = ("GET", "HEAD")
+REQUEST_ATTEMPTS = 3
+RETRY_INITIAL = 0.05
+RETRY_MAX = 1.0
+
+def make_http_client(backend="aiohttp", unix_socket=None, max_concurrency=DEFAULT_MAX_CONCURRENCY):
+    """Build the shared httpx.AsyncClient for `backend`, or None to use aiohttp"""
+    if backend == "aiohttp":
+        return None
+    if httpx is None:
+        print("WARNING: --client httpx needs httpx (pip install 'httpx[http2]'); using aiohttp")
+        return None
+    http2 = h2 is not None
+    # Same cap as the aiohttp connector: no more sockets than requests in flight
+    limits = httpx.Limits(max_connections=max_concurrency, max_keepalive_connections=max_concurrency)
+    transport = httpx.AsyncHTTPTransport(http2=http2, limits=limits, uds=unix_socket)
+    return httpx.AsyncClient(http2=http2, transport=transport, timeout=httpx.Timeout(30.0, connect=5.0))
+
+@lru_cache(maxsize=None)
+def task_body_template(priority, operation, input_value, id_prefix="perf-test-"):
+    """Encoded POST /task/create body with __ID__/__N__ placeholders for the counter"""
+    return json_dumpb({
+        "id": f"{id_prefix}__ID__",
+        "title": "Performance Test Task __N__",
+        "priority": priority,
+        "data": {
+            "type": "calculation",
+            "input": input_value,
+            "operation": operation
+        }
+    })
+
+# Per-task columns (structure of arrays), indexed by the int a task's record
+# gets at creation. Timestamps are integer perf_counter_ns() readings; a zero
+# completed_ns marks a workflow that didn't finish
+TASK_COLUMNS = {
+    "priority": np.int8,
+    "operation_id": np.int8,
+    "input_val": np.int32,
+    "batch_id": np.int16,
+    "created_ns": np.int64,
+    "processed_ns": np.int64,
+    "completed_ns": np.int64,
+}
 
 class TaskProcessorTester:
-    def __init__(self, orchestrator_url="http://localhost:5000"):
-        self.orchestrator_url = orchestrator_url
+    def __init__(self, orchestrator_url="http://localhost:5000", max_concurrency=DEFAULT_MAX_CONCURRENCY,
+                 unix_socket=None, poll_initial=POLL_INITIAL, poll_max=POLL_MAX, client=None,
+                 expected_tasks=0, batch_create=False, run_sync_endpoint=False, events=False,
+                 id_prefix="perf-test-"):
+        # Over a Unix socket the host part is only used for the Host header
+        self.orchestrator_url = "http://localhost" if unix_socket else orchestrator_url
         self.task_counter = 0
+        self.id_prefix = id_prefix  # Task ids are id_prefix + zero-padded counter
         self.results = []
+        # Task records: one preallocated array per field plus the id strings,
+        # sized up front for the whole run so recording never reallocates
+        self.n_tasks = 0
+        self.task_ids = []
+        capacity = max(256, expected_tasks)
+        for name, dtype in TASK_COLUMNS.items():
+            setattr(self, name, np.zeros(capacity, dtype=dtype))
+        # One bounded connector for the shared session, and a matching cap on
+        # in-flight workflows so requests queue here instead of in the pool
+        self.max_concurrency = max_concurrency
+        self.poll_initial = poll_initial
+        self.poll_max = poll_max
+        self.session = None  # Opened by __aenter__ and reused by every test
+        # Given an httpx client (owned by the caller), request/response calls
+        # go through it; the long-lived /events stream stays on the session
+        self.client = client
+        self.http_version = "HTTP/1.1"  # Last negotiated version (aiohttp only speaks 1.1)
+        if unix_socket:
+            self._connector = aiohttp.UnixConnector(path=unix_socket, limit=max_concurrency,
+                                                    limit_per_host=max_concurrency, force_close=False)
+        else:
+            # Resolve off the thread pool when aiodns is present, and cache
+            # lookups for longer than any single run
+            resolver = aiohttp.AsyncResolver() if aiodns is not None else None
+            self._connector = aiohttp.TCPConnector(limit=max_concurrency, limit_per_host=max_concurrency,
+                                                   resolver=resolver, use_dns_cache=True, ttl_dns_cache=600,
+                                                   force_close=False, enable_cleanup_closed=True)
+        self._sem = asyncio.Semaphore(max_concurrency)
+        # Monotonic clocks (immune to wall-clock jumps): integer nanoseconds for
+        # the per-task timestamps, float seconds for phase timings and timeouts.
+        # Not loop.time(): uvloop's timer clock only has millisecond resolution
+        self._now_ns = time.perf_counter_ns
+        self._now = time.monotonic
+        # Status push via the opt-in GET /events SSE stream: one listener sets
+        # a per-task Event, and waiters fall back to polling when the stream
+        # is disabled or the server doesn't have it
+        self._status_events = {}
+        self._events_supported = None if events else False  # None until the stream has been probed
+        self._events_lock = asyncio.Lock()
+        self._event_listener = None
+        self._event_response = None
+        # POST /task/create_batch is opt-in (both bundled servers have it)
+        self._batch_create_supported = batch_create  # Cleared if the route is missing
+        # POST /task/run_sync is opt-in too (both have it); cleared if the route is missing
+        self._run_sync_supported = run_sync_endpoint
+        self._head_status_supported = True  # Cleared if HEAD lacks X-Task-Status
+        self._stats_cache = (0.0, None)  # (fetched at, /stats JSON)
+        self.retry_counts = Counter()  # "retried" attempts, requests "failed" after all attempts
+        self._stats_lock = asyncio.Lock()
         
-    async def create_task(self, session, priority=2, operation="factorial", input_value=10):
-        """Create a task with specified priority (stored but doesn't affect processing order)"""
-        self.task_counter += 1
-        task_data = {
-            "id": f"perf-test-{self.task_counter:06d}",
-            "title": f"Performance Test Task {self.task_counter}",
-            "priority": priority,
-            "data": {
-                "type": "calculation",
-                "input": input_value,
-                "operation": operation
-            }
+    async def __aenter__(self):
+        self.session = aiohttp.ClientSession(connector=self._connector, json_serialize=json_dumps)
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.stop_event_stream()
+        await self.session.close()
+    
+    async def _request(self, method, path, data=None, headers=None):
+        """Send one request; return (HTTP status, headers, decoded JSON on a 200).
+        
+        RETRY_ERRORS (IDEMPOTENT_RETRY_ERRORS for GET/HEAD) are retried with
+        exponential backoff and counted in retry_counts, so transient network
+        hiccups aren't reported as capacity failures; the last one is raised
+        after REQUEST_ATTEMPTS tries. POSTs are never resent once they may
+        have reached the server, so creates and completes can't be duplicated.
+        """
+        retry_errors = IDEMPOTENT_RETRY_ERRORS if method in IDEMPOTENT_METHODS else RETRY_ERRORS
+        delay = RETRY_INITIAL
+        for attempt in range(1, REQUEST_ATTEMPTS + 1):
+            try:
+                return await self._send(method, path, data, headers)
+            except retry_errors:
+                if attempt == REQUEST_ATTEMPTS:
+                    self.retry_counts["failed"] += 1
+                    raise
+                self.retry_counts["retried"] += 1
+            await asyncio.sleep(delay)
+            delay = min(RETRY_MAX, delay * 2)
+    
+    async def _send(self, method, path, data, headers):
+        """One attempt of _request"""
+        url = f"{self.orchestrator_url}{path}"
+        if self.client is not None:
+            response = await self.client.request(method, url, content=data, headers=headers)
+            self.http_version = response.http_version
+            payload = json_loads(response.content) if response.status_code == 200 and method != "HEAD" else None
+            return response.status_code, response.headers, payload
+        async with self.session.request(method, url, data=data, headers=headers) as response:
+            payload = json_loads(await response.read()) if response.status == 200 and method != "HEAD" else None
+            return response.status, response.headers, payload
+    
+    def _reserve(self, count):
+        """Grow every task column so `count` more records fit"""
+        needed = self.n_tasks + count
+        capacity = self.created_ns.size
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity)
+            for name in TASK_COLUMNS:
+                old = getattr(self, name)
+                new = np.zeros(capacity, dtype=old.dtype)
+                new[:self.n_tasks] = old[:self.n_tasks]
+                setattr(self, name, new)
+    
+    def record_creation(self, task_id, priority, op_id, input_value, now):
+        """Store a created task in the columns and return its record index"""
+        index = self.n_tasks
+        if index == self.created_ns.size:
+            self._reserve(1)
+        self.n_tasks = index + 1
+        self.task_ids.append(task_id)
+        self.priority[index] = priority
+        self.operation_id[index] = op_id
+        self.input_val[index] = input_value
+        self.created_ns[index] = now
+        return index
+    
+    def record_creations(self, task_ids, task_list, now):
+        """record_creation for many (priority, operation, input) tasks at once.
+        
+        Writes each column with one slice assignment and returns the range of
+        new record indices.
+        """
+        count = len(task_ids)
+        self._reserve(count)
+        start = self.n_tasks
+        stop = self.n_tasks = start + count
+        self.task_ids.extend(task_ids)
+        if count:
+            priorities, operations, inputs = zip(*task_list)
+            self.priority[start:stop] = priorities
+            self.operation_id[start:stop] = [OPERATION_IDS[operation] for operation in operations]
+            self.input_val[start:stop] = inputs
+            self.created_ns[start:stop] = now
+        return range(start, stop)
+    
+    def export_records(self, indices):
+        """Copy the given records out as (task ids, {column: values})"""
+        return [self.task_ids[index] for index in indices], {name: getattr(self, name)[indices]
+                                                            for name in TASK_COLUMNS}
+    
+    def import_records(self, task_ids, columns):
+        """Append records produced by export_records; return their new indices"""
+        count = len(task_ids)
+        self._reserve(count)
+        start = self.n_tasks
+        stop = self.n_tasks = start + count
+        self.task_ids.extend(task_ids)
+        for name, values in columns.items():
+            getattr(self, name)[start:stop] = values
+        return np.arange(start, stop)
+    
+    def save_results(self, directory, round_robin_results, load_results, operation_results, stability_results):
+        """Write each phase's task records, and the stability summary, to
+        results_<phase>.parquet files in `directory` (needs pandas and pyarrow)"""
+        import pandas as pd  # Only needed here; slow to import
+        os.makedirs(directory, exist_ok=True)
+        phases = {
+            "round_robin": round_robin_results,
+            "load": load_results,
+            "operations": np.concatenate([np.empty(0, dtype=np.intp), *operation_results.values()]),
         }
+        for phase, indices in phases.items():
+            task_ids, columns = self.export_records(indices)
+            pd.DataFrame({"task_id": task_ids, **columns}).to_parquet(
+                os.path.join(directory, f"results_{phase}.parquet"), compression="zstd", index=False)
+        if stability_results:
+            pd.DataFrame([stability_results]).to_parquet(
+                os.path.join(directory, "results_stability.parquet"), compression="zstd", index=False)
+    
+    def read_results(self, directory):
+        """Load files written by save_results into the task columns and return
+        (round_robin, load, operation, stability) results shaped like the tests'"""
+        import pandas as pd  # Only needed here; slow to import
+        phases = {}
+        for phase in ("round_robin", "load", "operations"):
+            frame = pd.read_parquet(os.path.join(directory, f"results_{phase}.parquet"))
+            phases[phase] = self.import_records(frame["task_id"].tolist(),
+                                                {name: frame[name].to_numpy() for name in TASK_COLUMNS})
+        operations = phases["operations"]
+        operation_ids = self.operation_id[operations]
+        operation_results = {operation: operations[operation_ids == op_id]
+                             for operation, op_id in OPERATION_IDS.items()}
+        stability_path = os.path.join(directory, "results_stability.parquet")
+        stability_results = {}
+        if os.path.exists(stability_path):
+            stability_results = pd.read_parquet(stability_path).to_dict("records")[0]
+        return phases["round_robin"], phases["load"], operation_results, stability_results
+    
+    async def bounded(self, coro):
+        """Await `coro` while holding one of the max_concurrency in-flight slots"""
+        async with self._sem:
+            return await coro
+    
+    def processing_times(self, indices):
+        """Created-to-processed durations (seconds) for the given record indices"""
+        return (self.processed_ns[indices] - self.created_ns[indices]) / 1e9
+    
+    def total_times(self, indices):
+        """Created-to-completed durations (seconds) for the given record indices"""
+        return (self.completed_ns[indices] - self.created_ns[indices]) / 1e9
+    
+    def next_task_body(self, priority, operation, input_value):
+        """Return (task id, encoded POST /task/create body) for the next task"""
+        self.task_counter += 1
+        number = str(self.task_counter)
+        padded = number.zfill(6)
+        body = task_body_template(priority, operation, input_value, self.id_prefix)
+        body = body.replace(b"__ID__", padded.encode()).replace(b"__N__", number.encode())
+        return f"{self.id_prefix}{padded}", body
+    
+    async def create_task(self, priority=2, operation="factorial", input_value=10, task_body=None):
+        """Create a task with specified priority (stored but doesn't affect processing order).
         
-        start_time = time.time()
-        async with session.post(f"{self.orchestrator_url}/task/create", 
-                               json=task_data) as response:
-            if response.status == 200:
-                result = await response.json()
-                return {
-                    "task_id": result["task_id"],
-                    "created_at": start_time,
-                    "priority": priority,
-                    "operation": operation,
-                    "input": input_value
-                }
-            else:
-                print(f"Failed to create task: {response.status}")
-                return None
+        task_body is a (task id, body) pair from next_task_body to send
+        instead of numbering a new one (used by the fallbacks, so an id is
+        never spent twice).
+        """
+        _, body = task_body or self.next_task_body(priority, operation, input_value)
+        
+        start_ns = self._now_ns()
+        status, _, result = await self._request("POST", "/task/create", body, JSON_HEADERS)
+        if status == 200:
+            return self.record_creation(result["task_id"], priority, OPERATION_IDS[operation],
+                                        input_value, start_ns)
+        else:
+            print(f"Failed to create task: {status}")
+            return None
     
-    async def get_task_status(self, session, task_id):
+    async def create_tasks_batch(self, task_list):
+        """Create many (priority, operation, input) tasks with one POST /task/create_batch.
+        
+        Only tried when enabled (batch_create); otherwise, or when the server
+        has no batch route (404/405), the same bodies go out as concurrent
+        single creates. Returns the created record indices; failures are dropped.
+        """
+        bodies = [self.next_task_body(*params) for params in task_list]
+        if self._batch_create_supported:
+            batch_body = b'{"tasks":[' + b",".join(body for _, body in bodies) + b"]}"
+            start_ns = self._now_ns()
+            status, _, result = await self._request("POST", "/task/create_batch", batch_body, JSON_HEADERS)
+            if status == 200:
+                created = set(result.get("task_ids", ()))
+                kept = [(task_id, params) for (task_id, _), params in zip(bodies, task_list)
+                        if task_id in created]
+                return self.record_creations([task_id for task_id, _ in kept],
+                                             [params for _, params in kept], start_ns)
+            if status not in (404, 405):
+                print(f"Failed to create task batch: {status}")
+                return []
+            self._batch_create_supported = False
+        
+        indices = await asyncio.gather(*(self.create_task(*params, task_body=task_body)
+                                         for params, task_body in zip(task_list, bodies)))
+        return [index for index in indices if index is not None]
+    
+    async def get_task_status(self, task_id):
         """Get task status"""
-        async with session.get(f"{self.orchestrator_url}/task/{task_id}") as response:
-            if response.status == 200:
-                return await response.json()
-            return None
+        _, _, task = await self._request("GET", f"/task/{task_id}")
+        return task
     
-    async def complete_task(self, session, task_id):
+    async def poll_task_status(self, task_id):
+        """Return (status string, task JSON or None) for one polling step.
+        
+        Uses HEAD /task/{id} and its X-Task-Status header while the status is
+        still pending, and fetches the JSON body only once the task has been
+        processed. Servers without the header are polled with GET instead.
+        """
+        if self._head_status_supported:
+            status, headers, _ = await self._request("HEAD", f"/task/{task_id}")
+            current_status = headers.get("X-Task-Status")
+            if status == 405 or (status == 200 and current_status is None):
+                self._head_status_supported = False
+            if self._head_status_supported and current_status not in TERMINAL_OR_PROCESSED:
+                return current_status, None
+        
+        status = await self.get_task_status(task_id)
+        return (status.get("status") if status else None), status
+    
+    async def complete_task(self, task_id):
         """Complete task via API (required workflow)"""
-        async with session.post(f"{self.orchestrator_url}/task/{task_id}/complete") as response:
-            if response.status == 200:
-                return await response.json()
-            return None
+        _, _, result = await self._request("POST", f"/task/{task_id}/complete")
+        return result
+    
+    async def start_event_stream(self):
+        """Open the /events status stream once; return True if available"""
+        if self._events_supported is False:
+            return False  # Disabled, or known to be missing: no probe, no lock
+        async with self._events_lock:
+            if self._events_supported is None:
+                try:
+                    response = await self.session.get(f"{self.orchestrator_url}/events",
+                                                      headers={"Accept": "text/event-stream"},
+                                                      timeout=aiohttp.ClientTimeout(total=None, sock_connect=5))
+                except aiohttp.ClientError:
+                    self._events_supported = False
+                    return False
+                if response.status != 200:
+                    response.release()
+                    self._events_supported = False
+                    return False
+                self._events_supported = True
+                self._event_response = response
+                self._event_listener = asyncio.create_task(self._read_events(response))
+            return self._events_supported
     
-    async def wait_for_processing(self, session, task_id, timeout=60):
-        """Wait for task to be processed (status = processing)"""
-        start_time = time.time()
+    async def _read_events(self, response):
+        """Dispatch `data: {"task_id", "status"}` SSE messages to waiting tasks"""
+        try:
+            async for line in response.content:
+                if not line.startswith(b"data:"):
+                    continue
+                try:
+                    message = json_loads(line[5:])
+                except ValueError:
+                    continue
+                task_id = message.get("task_id") or message.get("id")
+                if task_id and message.get("status") in TERMINAL_OR_PROCESSED:
+                    self._status_events.setdefault(task_id, asyncio.Event()).set()
+        except (aiohttp.ClientError, asyncio.CancelledError):
+            pass
+        finally:
+            response.release()
+            # Stream closed: wake every waiter so it re-reads status, and
+            # probe the stream again on the next wait
+            for event in self._status_events.values():
+                event.set()
+            if self._event_listener is asyncio.current_task():
+                self._events_supported = None
+                self._event_listener = None
+                self._event_response = None
+    
+    async def stop_event_stream(self):
+        """Cancel the status stream listener, if one is running"""
+        listener, self._event_listener = self._event_listener, None
+        if listener is not None:
+            listener.cancel()
+            await asyncio.gather(listener, return_exceptions=True)
+            # A listener cancelled before its first step never reaches its
+            # finally, so release the stream and re-arm the probe here too
+            self._event_response.release()
+            self._event_response = None
+            if self._events_supported:
+                self._events_supported = None
+    
+    async def wait_for_processing(self, task_id, timeout=60):
+        """Wait for task to be processed (status = processing).
+        
+        Returns (last status string seen, task JSON or None on timeout).
+        """
+        if await self.start_event_stream():
+            event = self._status_events.setdefault(task_id, asyncio.Event())
+            try:
+                # The task may have moved on before we subscribed, so read once
+                status = await self.get_task_status(task_id)
+                if not (status and status.get("status") in TERMINAL_OR_PROCESSED):
+                    try:
+                        await asyncio.wait_for(event.wait(), timeout)
+                    except asyncio.TimeoutError:
+                        pass
+                    status = await self.get_task_status(task_id)
+            finally:
+                self._status_events.pop(task_id, None)
+            last_status = status.get("status") if status else None
+            if last_status in TERMINAL_OR_PROCESSED:
+                return last_status, status
+            print(f"Task {task_id} timeout after {timeout}s (last status: {last_status})")
+            return last_status, None
+        
+        start_time = self._now()
         last_status = None
-        while time.time() - start_time < timeout:
-            status = await self.get_task_status(session, task_id)
+        delay = self.poll_initial
+        while self._now() - start_time < timeout:
+            current_status, status = await self.poll_task_status(task_id)
             if status:
-                current_status = status.get("status")
                 if current_status == "processing":
-                    return status
+                    return current_status, status
                 elif current_status in ["completed", "failed"]:
                     # Task already completed or failed, return it
-                    return status
+                    return current_status, status
+            if current_status:
                 last_status = current_status
-            await asyncio.sleep(0.1)
+            await asyncio.sleep(delay)
+            delay = min(self.poll_max, delay * POLL_BACKOFF)
         
         print(f"Task {task_id} timeout after {timeout}s (last status: {last_status})")
-        return None
+        return last_status, None
     
-    async def complete_workflow(self, session, task_info):
-        """Complete workflow: create -> wait for processing -> complete via API"""
-        if not task_info:
+    async def complete_workflow(self, index, failures=None):
+        """Complete workflow: create -> wait for processing -> complete via API.
+        
+        Given a failures Counter, a workflow that gives up adds its reason:
+        "status:<last status>" when processing timed out,
+        "bookkeeping_failed" when the completion was rejected.
+        """
+        if index is None:
             return None
             
-        task_id = task_info["task_id"]
+        task_id = self.task_ids[index]
         
         # Wait for task to be processed
-        processed_status = await self.wait_for_processing(session, task_id)
+        last_status, processed_status = await self.wait_for_processing(task_id)
         if not processed_status:
             print(f"Task {task_id} failed to process")
+            if failures is not None:
+                failures[f"status:{last_status}"] += 1
             return None
         
-        processing_time = time.time()
+        self.processed_ns[index] = self._now_ns()
         
         # Complete via API (required workflow)
-        completion_result = await self.complete_task(session, task_id)
+        completion_result = await self.complete_task(task_id)
         if not completion_result:
             print(f"Failed to complete task {task_id}")
+            if failures is not None:
+                failures["bookkeeping_failed"] += 1
             return None
         
-        completion_time = time.time()
+        self.completed_ns[index] = self._now_ns()
+        return index
+
+    async def run_sync(self, priority=2, operation="factorial", input_value=10):
+        """Create, process and complete a task with one POST /task/run_sync.
         
-        return {
-            "task_id": task_id,
-            "priority": task_info["priority"],
-            "operation": task_info["operation"],
-            "input": task_info["input"],
-            "created_at": task_info["created_at"],
-            "processed_at": processing_time,
-            "completed_at": completion_time,
-            "total_time": completion_time - task_info["created_at"],
-            "processing_time": processing_time - task_info["created_at"],
-            "completion_time": completion_time - processing_time
-        }
+        Only tried when enabled (run_sync_endpoint); otherwise, or when the
+        server has no fused route (404/405), runs create_task +
+        complete_workflow with the same task id. Returns the record index, or
+        None on failure.
+        """
+        task_body = self.next_task_body(priority, operation, input_value)
+        if self._run_sync_supported:
+            task_id, body = task_body
+            start_ns = self._now_ns()
+            status, _, result = await self._request("POST", "/task/run_sync", body, JSON_HEADERS)
+            if status == 200:
+                index = self.record_creation(result.get("task_id", task_id), priority,
+                                             OPERATION_IDS[operation], input_value, start_ns)
+                # Processing and completion happen inside the one call
+                self.processed_ns[index] = self.completed_ns[index] = self._now_ns()
+                return index
+            if status not in (404, 405):
+                print(f"Failed to run task: {status}")
+                return None
+            self._run_sync_supported = False
+        
+        return await self.complete_workflow(await self.create_task(priority, operation, input_value,
+                                                                    task_body=task_body))
 
     async def test_round_robin_distribution(self, num_tasks=30):
         """Test that tasks are distributed evenly in round-robin fashion"""
         print("=== Round-Robin Distribution Test ===")
         
-        async with aiohttp.ClientSession() as session:
-            tasks = []
+        # Create mixed priority tasks (priority stored but doesn't affect processing)
+        creation_start = self._now()
+        
+        # Create all tasks in one batch (or one concurrent burst without batch support);
+        # priorities cycle 1-3 so each level gets an equal share
+        tasks = await self.create_tasks_batch([
+            ((i % 3) + 1, OPERATIONS[i % 3], DISTRIBUTION_INPUTS[i % 3])
+            for i in range(num_tasks)
+        ])
+            
+        creation_time = self._now() - creation_start
+        print(f"Created {len(tasks)} tasks in {creation_time:.2f}s")
+        
+        # Process tasks with a fixed pool of workers fed from a bounded queue,
+        # so only max_concurrency workflows (and frames) exist at a time
+        workflow_start = self._now()
+        worker_count = max(1, min(self.max_concurrency, len(tasks)))
+        queue = asyncio.Queue(maxsize=worker_count * 2)
+        # Why workflows failed: "status:<last status>" when processing timed
+        # out, "bookkeeping_failed" when the completion was rejected,
+        # "exception" when it raised. None of them get timestamps, so all stay
+        # out of the timing aggregates
+        failures = Counter()
+        
+        async def producer():
+            for index in tasks:
+                await queue.put(index)
+            for _ in range(worker_count):
+                await queue.put(None)  # One stop marker per worker
+        
+        async def worker():
+            while (index := await queue.get()) is not None:
+                try:
+                    await self.complete_workflow(index, failures)
+                except Exception as e:
+                    print(f"Task {self.task_ids[index]} exception: {e}")
+                    failures["exception"] += 1
+        
+        # Wait for all tasks to complete
+        await asyncio.gather(producer(), *(worker() for _ in range(worker_count)))
+        
+        workflow_time = self._now() - workflow_start
+        
+        # Split this test's records by the success mask
+        indices = np.asarray(tasks, dtype=np.intp)
+        successful_tasks = indices[self.completed_ns[indices] > 0]
+        failed_count = len(tasks) - successful_tasks.size
+        
+        print(f"Completed {successful_tasks.size} tasks in {workflow_time:.2f}s")
+        if failed_count > 0:
+            print(f"Failed/timed out: {failed_count} tasks")
+            print(f"Failure breakdown: {dict(failures)}")
+        
+        # Continue with analysis only if we have enough successful tasks
+        if successful_tasks.size and successful_tasks.size >= num_tasks * 0.5:  # At least 50% success rate
+            order = np.argsort(self.processed_ns[successful_tasks], kind="stable")
+            successful_tasks = successful_tasks[order]
             
-            # Create mixed priority tasks (priority stored but doesn't affect processing)
-            priorities = [1, 2, 3] * (num_tasks // 3)  # Equal distribution
-            operations = ["factorial", "fibonacci", "prime_check"]
-            inputs = [5, 10, 15]
+            # Processing-order positions per priority (priorities should be mixed)
+            priorities = self.priority[successful_tasks]
+            counts = np.bincount(priorities, minlength=4)
             
-            creation_start = time.time()
+            print(f"\nRound-Robin Distribution Analysis:")
+            total_tasks = len(successful_tasks)
             
-            # Create all tasks quickly
-            for i in range(num_tasks):
-                priority = priorities[i % len(priorities)]
-                operation = operations[i % len(operations)]
-                input_val = inputs[i % len(inputs)]
+            for priority in [1, 2, 3]:
+                priority_name = PRIORITY_NAME[priority]
                 
-                task_info = await self.create_task(session, priority, operation, input_val)
-                if task_info:
-                    tasks.append(task_info)
+                if counts[priority]:
+                    positions = np.flatnonzero(priorities == priority)
+                    avg_position = positions.mean()
+                    position_spread = int(positions[-1] - positions[0])
+                    expected_spread = total_tasks * 0.6  # Should span most of the range
                     
-            creation_time = time.time() - creation_start
-            print(f"Created {len(tasks)} tasks in {creation_time:.2f}s")
-            
-            # Process tasks with better error handling and increased semaphore
-            workflow_start = time.time()
-            
-            # Use larger semaphore to handle more concurrent requests
-            semaphore = asyncio.Semaphore(15)
-            
-            async def process_task_with_retry(task_info):
-                async with semaphore:
-                    # First try with normal timeout
-                    result = await self.complete_workflow(session, task_info)
-                    if result is None:
-                        # If failed, wait a bit and check if task is already completed
-                        await asyncio.sleep(1)
-                        status = await self.get_task_status(session, task_info["task_id"])
-                        if status and status.get("status") == "completed":
-                            # Task was completed by another process, create result manually
-                            return {
-                                "task_id": task_info["task_id"],
-                                "priority": task_info["priority"],
-                                "operation": task_info["operation"],
-                                "input": task_info["input"],
-                                "created_at": task_info["created_at"],
-                                "processed_at": time.time(),
-                                "completed_at": time.time(),
-                                "total_time": time.time() - task_info["created_at"],
-                                "processing_time": time.time() - task_info["created_at"],
-                                "completion_time": 0
-                            }
-                    return result
-            
-            # Wait for all tasks to complete
-            completed_tasks = await asyncio.gather(*[process_task_with_retry(task) for task in tasks], return_exceptions=True)
-            
-            workflow_time = time.time() - workflow_start
-            
-            # Filter successful completions and exceptions
-            successful_tasks = []
-            failed_count = 0
-            for i, result in enumerate(completed_tasks):
-                if isinstance(result, Exception):
-                    print(f"Task {tasks[i]['task_id']} exception: {result}")
-                    failed_count += 1
-                elif result is not None:
-                    successful_tasks.append(result)
-                else:
-                    failed_count += 1
+                    print(f"   {priority_name} Priority ({priority}): {len(positions)} tasks, "
+                          f"avg position: {avg_position:.1f}, spread: {position_spread}")
+                    
+                    # Check if positions are well distributed (not clustered)
+                    if position_spread >= expected_spread and len(positions) > 2:
+                        print(f"     PASS: Well distributed across processing order")
+                    elif len(positions) <= 2:
+                        print(f"     PASS: Small sample but distributed")
+                    else:
+                        print(f"     WARNING: May be clustered (expected spread: {expected_spread:.0f})")
             
-            print(f"Completed {len(successful_tasks)} tasks in {workflow_time:.2f}s")
-            if failed_count > 0:
-                print(f"Failed/timed out: {failed_count} tasks")
-                
-                # Check status of failed tasks
-                failed_statuses = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
-                for i, result in enumerate(completed_tasks):
-                    if result is None or isinstance(result, Exception):
-                        task_id = tasks[i]["task_id"]
-                        status = await self.get_task_status(session, task_id)
-                        if status:
-                            current_status = status.get("status", "unknown")
-                            failed_statuses[current_status] = failed_statuses.get(current_status, 0) + 1
-                
-                print(f"Status of failed tasks: {dict(failed_statuses)}")
+            # Calculate overall processing metrics
+            processing_times = self.processing_times(successful_tasks)
+            total_times = self.total_times(successful_tasks)
             
-            # Continue with analysis only if we have enough successful tasks
-            if successful_tasks and len(successful_tasks) >= num_tasks * 0.5:  # At least 50% success rate
-                successful_tasks.sort(key=lambda x: x["processed_at"])
-                
-                # Group by priority to verify round-robin (priorities should be mixed)
-                priority_positions = {1: [], 2: [], 3: []}
-                for i, task in enumerate(successful_tasks):
-                    priority_positions[task["priority"]].append(i)
-                
-                print(f"\nRound-Robin Distribution Analysis:")
-                total_tasks = len(successful_tasks)
-                
-                for priority in [1, 2, 3]:
-                    positions = priority_positions[priority]
-                    priority_name = {1: "LOW", 2: "MEDIUM", 3: "HIGH"}[priority]
-                    
-                    if positions:
-                        avg_position = statistics.mean(positions)
-                        position_spread = max(positions) - min(positions) if len(positions) > 1 else 0
-                        expected_spread = total_tasks * 0.6  # Should span most of the range
-                        
-                        print(f"   {priority_name} Priority ({priority}): {len(positions)} tasks, "
-                              f"avg position: {avg_position:.1f}, spread: {position_spread}")
-                        
-                        # Check if positions are well distributed (not clustered)
-                        if position_spread >= expected_spread and len(positions) > 2:
-                            print(f"     PASS: Well distributed across processing order")
-                        elif len(positions) <= 2:
-                            print(f"     PASS: Small sample but distributed")
-                        else:
-                            print(f"     WARNING: May be clustered (expected spread: {expected_spread:.0f})")
-                
-                # Calculate overall processing metrics
-                processing_times = [t["processing_time"] for t in successful_tasks]
-                total_times = [t["total_time"] for t in successful_tasks]
-                
-                print(f"\nProcessing Performance:")
-                print(f"   Average processing time: {statistics.mean(processing_times):.3f}s")
-                print(f"   Average total time: {statistics.mean(total_times):.3f}s")
-                print(f"   Processing throughput: {len(successful_tasks) / workflow_time:.2f} tasks/sec")
-                print(f"   Success rate: {len(successful_tasks)}/{len(tasks)} ({len(successful_tasks)/len(tasks)*100:.1f}%)")
-                
-                return successful_tasks
-            else:
-                print(f"WARNING: Too many failed tasks ({failed_count}/{len(tasks)}) for reliable analysis")
-                return successful_tasks if successful_tasks else []
+            print(f"\nProcessing Performance:")
+            print(f"   Average processing time: {processing_times.mean():.3f}s")
+            print(f"   Average total time: {total_times.mean():.3f}s")
+            print(f"   Processing throughput: {len(successful_tasks) / workflow_time:.2f} tasks/sec")
+            print(f"   Success rate: {len(successful_tasks)}/{len(tasks)} ({len(successful_tasks)/len(tasks)*100:.1f}%)")
+            
+            return successful_tasks
+        else:
+            print(f"WARNING: Too many failed tasks ({failed_count}/{len(tasks)}) for reliable analysis")
+            return successful_tasks
 
-    async def test_concurrent_load(self, concurrent_batches=5, tasks_per_batch=10):
-        """Test system performance under concurrent load"""
+    async def test_concurrent_load(self, concurrent_batches=5, tasks_per_batch=10, first_batch=0):
+        """Test system performance under concurrent load (batch ids start at first_batch)"""
         print("=== Concurrent Load Test ===")
         
-        async with aiohttp.ClientSession() as session:
-            all_results = []
-            
-            # Create multiple batches of tasks concurrently
-            batch_tasks = []
-            for batch_id in range(concurrent_batches):
-                batch = []
-                for task_id in range(tasks_per_batch):
-                    priority = (task_id % 3) + 1
-                    operation = ["factorial", "fibonacci", "prime_check"][task_id % 3]
-                    input_val = [8, 15, 1000][task_id % 3]  # Varied complexity
-                    
-                    batch.append((priority, operation, input_val))
-                batch_tasks.append(batch)
-            
-            print(f"Testing {concurrent_batches} concurrent batches of {tasks_per_batch} tasks each")
-            
-            start_time = time.time()
-            
-            # Process all batches concurrently
-            async def process_batch(batch_id, batch):
-                batch_results = []
-                for priority, operation, input_val in batch:
-                    task_info = await self.create_task(session, priority, operation, input_val)
-                    if task_info:
-                        result = await self.complete_workflow(session, task_info)
-                        if result:
-                            result["batch_id"] = batch_id
-                            batch_results.append(result)
-                return batch_results
-            
-            # Run all batches concurrently
-            batch_results = await asyncio.gather(*[
-                process_batch(batch_id, batch) 
-                for batch_id, batch in enumerate(batch_tasks)
-            ])
-            
-            end_time = time.time()
-            
-            # Flatten results
-            for batch_result in batch_results:
-                all_results.extend(batch_result)
-            
-            total_time = end_time - start_time
-            successful_tasks = len(all_results)
-            expected_tasks = concurrent_batches * tasks_per_batch
-            
-            print(f"Concurrent load results:")
-            print(f"  Total time: {total_time:.2f}s")
-            print(f"  Completed tasks: {successful_tasks}/{expected_tasks}")
-            print(f"  Success rate: {successful_tasks/expected_tasks*100:.1f}%")
-            print(f"  Throughput: {successful_tasks/total_time:.2f} tasks/sec")
-            
-            if all_results:
-                processing_times = [r["processing_time"] for r in all_results]
-                total_times = [r["total_time"] for r in all_results]
+        # Create multiple batches of tasks concurrently
+        batch_tasks = []
+        for batch_id in range(concurrent_batches):
+            batch = []
+            for task_id in range(tasks_per_batch):
+                priority = (task_id % 3) + 1
+                operation = OPERATIONS[task_id % 3]
+                input_val = LOAD_INPUTS[task_id % 3]
                 
-                print(f"  Avg processing time: {statistics.mean(processing_times):.3f}s")
-                print(f"  Avg total time: {statistics.mean(total_times):.3f}s")
-                print(f"  Min processing time: {min(processing_times):.3f}s")
-                print(f"  Max processing time: {max(processing_times):.3f}s")
+                batch.append((priority, operation, input_val))
+            batch_tasks.append(batch)
+        
+        print(f"Testing {concurrent_batches} concurrent batches of {tasks_per_batch} tasks each")
+        
+        start_time = self._now()
+        
+        # Process all batches concurrently
+        async def process_batch(batch_id, batch):
+            batch_results = []
+            for priority, operation, input_val in batch:
+                result = await self.bounded(self.run_sync(priority, operation, input_val))
+                if result is not None:
+                    self.batch_id[result] = first_batch + batch_id
+                    batch_results.append(result)
+            return batch_results
+        
+        # Run all batches concurrently; a failing batch only loses its own results
+        batch_results = await asyncio.gather(*[
+            process_batch(batch_id, batch) 
+            for batch_id, batch in enumerate(batch_tasks)
+        ], return_exceptions=True)
+        
+        end_time = self._now()
+        
+        for batch_id, batch_result in enumerate(batch_results):
+            if isinstance(batch_result, Exception):
+                print(f"  Batch {batch_id} exception: {batch_result}")
+                batch_results[batch_id] = ()
+        
+        # Flatten results
+        all_results = np.fromiter((index for batch_result in batch_results for index in batch_result),
+                                  dtype=np.intp)
+        
+        total_time = end_time - start_time
+        successful_tasks = all_results.size
+        expected_tasks = concurrent_batches * tasks_per_batch
+        
+        print(f"Concurrent load results:")
+        print(f"  Total time: {total_time:.2f}s")
+        print(f"  Completed tasks: {successful_tasks}/{expected_tasks}")
+        print(f"  Success rate: {successful_tasks/expected_tasks*100:.1f}%")
+        print(f"  Throughput: {successful_tasks/total_time:.2f} tasks/sec")
+        
+        if all_results.size:
+            processing_times = self.processing_times(all_results)
+            total_times = self.total_times(all_results)
             
-            return all_results
+            print(f"  Avg processing time: {processing_times.mean():.3f}s")
+            print(f"  Avg total time: {total_times.mean():.3f}s")
+            print(f"  Min processing time: {processing_times.min():.3f}s")
+            print(f"  Max processing time: {processing_times.max():.3f}s")
+        
+        return all_results
 
     async def test_operation_performance(self):
         """Test performance of different operations"""
@@ -340,25 +807,18 @@ class TaskProcessorTester:
         
         results = {}
         
-        async with aiohttp.ClientSession() as session:
-            for operation, inputs in operations_config:
-                print(f"\nTesting {operation} operation...")
-                operation_results = []
-                
-                for input_val in inputs:
-                    # Create and process task
-                    task_info = await self.create_task(session, 2, operation, input_val)
-                    if task_info:
-                        result = await self.complete_workflow(session, task_info)
-                        if result:
-                            operation_results.append({
-                                "input": input_val,
-                                "processing_time": result["processing_time"],
-                                "total_time": result["total_time"]
-                            })
-                            print(f"  {operation}({input_val}): {result['processing_time']:.3f}s")
-                
-                results[operation] = operation_results
+        for operation, inputs in operations_config:
+            print(f"\nTesting {operation} operation...")
+            operation_results = []
+            
+            for input_val in inputs:
+                # Create, process and complete the task
+                result = await self.run_sync(2, operation, input_val)
+                if result is not None:
+                    operation_results.append(result)
+                    print(f"  {operation}({input_val}): {self.processing_times(result):.3f}s")
+            
+            results[operation] = np.asarray(operation_results, dtype=np.intp)
         
         return results
 
@@ -367,142 +827,154 @@ class TaskProcessorTester:
         print("=== System Stability Test ===")
         print(f"Running sustained load test for {duration_seconds} seconds...")
         
-        async with aiohttp.ClientSession() as session:
-            # Get initial system stats
-            initial_stats = await self.get_system_stats()
-            initial_processed = initial_stats.get('total_tasks_processed', 0) if initial_stats else 0
-            initial_completed = initial_stats.get('total_tasks_completed', 0) if initial_stats else 0
+        # Get initial system stats
+        initial_stats = await self.get_system_stats()
+        initial_processed = initial_stats.get('total_tasks_processed', 0) if initial_stats else 0
+        initial_completed = initial_stats.get('total_tasks_completed', 0) if initial_stats else 0
+        
+        start_time = deadline = self._now()
+        creations = []
+        
+        # Issue one create per fixed tick; the creates run in the background so
+        # a slow POST never pushes back the next deadline
+        while (deadline - start_time) < duration_seconds:
+            tick = len(creations)
+            priority = (tick % 3) + 1
+            operation = OPERATIONS[tick % 3]
+            input_val = STABILITY_INPUTS[tick % 3]
             
-            results = []
-            start_time = time.time()
-            task_creation_times = []
-            created_task_ids = []
+            creations.append(asyncio.create_task(self.create_task(priority, operation, input_val)))
             
-            # Create tasks at regular intervals
-            while (time.time() - start_time) < duration_seconds:
-                interval_start = time.time()
-                
-                # Create a task
-                priority = ((len(created_task_ids) % 3) + 1)
-                operation = ["factorial", "fibonacci", "prime_check"][len(created_task_ids) % 3]
-                input_val = [10, 20, 1000][len(created_task_ids) % 3]
-                
-                task_info = await self.create_task(session, priority, operation, input_val)
-                if task_info:
-                    task_creation_times.append(time.time())
-                    created_task_ids.append(task_info["task_id"])
-                
-                # Maintain interval
-                elapsed = time.time() - interval_start
-                if elapsed < task_interval:
-                    await asyncio.sleep(task_interval - elapsed)
+            deadline += task_interval
+            sleep_for = deadline - self._now()
+            if sleep_for > 0:
+                await asyncio.sleep(sleep_for)
+        
+        total_runtime = self._now() - start_time
+        indices = await asyncio.gather(*creations)
+        created_task_ids = [self.task_ids[index] for index in indices if index is not None]
+        created_tasks = len(created_task_ids)
+        
+        # Check final system stats
+        final_stats = await self.get_system_stats()
+        if final_stats:
+            final_processed = final_stats.get('total_tasks_processed', 0)
+            #final_completed = final_stats.get('total_tasks_completed', 0)
             
-            total_runtime = time.time() - start_time
-            created_tasks = len(task_creation_times)
+            # Calculate stats just for this test
+            test_processed = final_processed - initial_processed
+            test_completed = test_processed
             
-            # Check final system stats
-            final_stats = await self.get_system_stats()
-            if final_stats:
-                final_processed = final_stats.get('total_tasks_processed', 0)
-                #final_completed = final_stats.get('total_tasks_completed', 0)
-                
-                # Calculate stats just for this test
-                test_processed = final_processed - initial_processed
-                test_completed = test_processed
+            print(f"Stability test results:")
+            print(f"  Runtime: {total_runtime:.2f}s")
+            print(f"  Tasks created by this test: {created_tasks}")
+            print(f"  Creation rate: {created_tasks/total_runtime:.2f} tasks/sec")
+            print(f"  Target creation rate: {1/task_interval:.2f} tasks/sec")
+            print(f"  Tasks processed during test: {test_processed}")
+            print(f"  Tasks completed during test: {test_completed}")
+            print(f"  System processing rate: {test_processed/total_runtime:.2f} tasks/sec")
+            print(f"  Protocol: {self.http_version}"
+                  f"{' (multiplexed)' if self.http_version == 'HTTP/2' else ''}")
+            
+            # Check a sample of created tasks to see their status
+            if created_task_ids:
+                sample_size = min(10, len(created_task_ids))
+                sample_tasks = created_task_ids[:sample_size]
+                statuses = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
                 
-                print(f"Stability test results:")
-                print(f"  Runtime: {total_runtime:.2f}s")
-                print(f"  Tasks created by this test: {created_tasks}")
-                print(f"  Creation rate: {created_tasks/total_runtime:.2f} tasks/sec")
-                print(f"  Target creation rate: {1/task_interval:.2f} tasks/sec")
-                print(f"  Tasks processed during test: {test_processed}")
-                print(f"  Tasks completed during test: {test_completed}")
-                print(f"  System processing rate: {test_processed/total_runtime:.2f} tasks/sec")
+                for task_id in sample_tasks:
+                    status_info = await self.get_task_status(task_id)
+                    if status_info:
+                        status = status_info.get("status", "unknown")
+                        statuses[status] = statuses.get(status, 0) + 1
                 
-                # Check a sample of created tasks to see their status
-                if created_task_ids:
-                    sample_size = min(10, len(created_task_ids))
-                    sample_tasks = created_task_ids[:sample_size]
-                    statuses = {"pending": 0, "processing": 0, "completed": 0, "failed": 0}
-                    
-                    for task_id in sample_tasks:
-                        status_info = await self.get_task_status(session, task_id)
-                        if status_info:
-                            status = status_info.get("status", "unknown")
-                            statuses[status] = statuses.get(status, 0) + 1
-                    
-                    print(f"  Sample task status ({sample_size} tasks):")
-                    for status, count in statuses.items():
-                        if count > 0:
-                            print(f"    {status}: {count}")
-            else:
-                print(f"Stability test results:")
-                print(f"  Runtime: {total_runtime:.2f}s")
-                print(f"  Tasks created: {created_tasks}")
-                print(f"  Creation rate: {created_tasks/total_runtime:.2f} tasks/sec")
-                print(f"  Target rate: {1/task_interval:.2f} tasks/sec")
-            
-            return {
-                "runtime": total_runtime,
-                "created_tasks": created_tasks,
-                "creation_rate": created_tasks/total_runtime,
-                "target_rate": 1/task_interval,
-                "test_processed": test_processed if final_stats else 0,
-                "test_completed": test_completed if final_stats else 0
-            }
+                print(f"  Sample task status ({sample_size} tasks):")
+                for status, count in statuses.items():
+                    if count > 0:
+                        print(f"    {status}: {count}")
+        else:
+            print(f"Stability test results:")
+            print(f"  Runtime: {total_runtime:.2f}s")
+            print(f"  Tasks created: {created_tasks}")
+            print(f"  Creation rate: {created_tasks/total_runtime:.2f} tasks/sec")
+            print(f"  Target rate: {1/task_interval:.2f} tasks/sec")
+        
+        return {
+            "runtime": total_runtime,
+            "created_tasks": created_tasks,
+            "creation_rate": created_tasks/total_runtime,
+            "target_rate": 1/task_interval,
+            "test_processed": test_processed if final_stats else 0,
+            "test_completed": test_completed if final_stats else 0
+        }
 
     async def get_system_stats(self):
-        """Get system statistics"""
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{self.orchestrator_url}/stats") as response:
-                if response.status == 200:
-                    return await response.json()
-                return None
+        """Get system statistics, reusing a response younger than STATS_TTL"""
+        # The lock collapses concurrent callers onto one in-flight request
+        async with self._stats_lock:
+            fetched_at, stats = self._stats_cache
+            if stats is not None and self._now() - fetched_at < STATS_TTL:
+                return stats
+            _, _, stats = await self._request("GET", "/stats")
+            self._stats_cache = (self._now(), stats)
+            return stats
 
-    def generate_report(self, round_robin_results, load_results, operation_results, stability_results):
-        """Generate performance report with visualizations"""
+    def generate_report(self, round_robin_results, load_results, operation_results, stability_results,
+                        plot_format="png", plot_style="boxplot"):
+        """Generate performance report with visualizations.
+        
+        Plain synchronous numpy/matplotlib work: main runs it on a worker
+        thread with asyncio.to_thread so it never blocks the event loop.
+        """
         print("\n" + "="*60)
         print("PERFORMANCE REPORT - Task Processing System (Round-Robin)")
         print("="*60)
         
         # Round-Robin Distribution Analysis
-        if round_robin_results:
+        if len(round_robin_results):
             print(f"\n1. ROUND-ROBIN DISTRIBUTION ANALYSIS")
             print(f"   Total tasks processed: {len(round_robin_results)}")
             
             # Analyze distribution by priority (should be mixed)
-            priority_groups = {1: [], 2: [], 3: []}
-            for task in round_robin_results:
-                priority_groups[task['priority']].append(task['processing_time'])
-            
-            for priority, times in priority_groups.items():
-                if times:
-                    priority_name = {1: "LOW", 2: "MEDIUM", 3: "HIGH"}[priority]
-                    avg_time = statistics.mean(times)
-                    min_time = min(times)
-                    max_time = max(times)
+            priorities = self.priority[round_robin_results]
+            processing_times = self.processing_times(round_robin_results)
+            
+            for priority in (1, 2, 3):
+                times = processing_times[priorities == priority]
+                if times.size:
+                    priority_name = PRIORITY_NAME[priority]
+                    avg_time = times.mean()
+                    min_time = times.min()
+                    max_time = times.max()
                     print(f"   {priority_name} Priority ({priority}): {len(times)} tasks, "
                           f"avg={avg_time:.3f}s, min={min_time:.3f}s, max={max_time:.3f}s")
+            
+            p50, p95, p99 = np.percentile(processing_times, [50, 95, 99])
+            print(f"   Processing time p50={p50:.3f}s, p95={p95:.3f}s, p99={p99:.3f}s")
         
         # Concurrent Load Analysis
-        if load_results:
+        if len(load_results):
             print(f"\n2. CONCURRENT LOAD ANALYSIS")
-            processing_times = [r['processing_time'] for r in load_results]
-            total_times = [r['total_time'] for r in load_results]
+            processing_times = self.processing_times(load_results)
+            total_times = self.total_times(load_results)
+            std_dev = processing_times.std(ddof=1) if processing_times.size > 1 else 0.0
             
             print(f"   Tasks completed: {len(load_results)}")
-            print(f"   Avg processing time: {statistics.mean(processing_times):.3f}s")
-            print(f"   Avg total time: {statistics.mean(total_times):.3f}s")
-            print(f"   Processing time std dev: {statistics.stdev(processing_times):.3f}s")
+            print(f"   Avg processing time: {processing_times.mean():.3f}s")
+            print(f"   Avg total time: {total_times.mean():.3f}s")
+            print(f"   Processing time std dev: {std_dev:.3f}s")
+            p50, p95, p99 = np.percentile(processing_times, [50, 95, 99])
+            print(f"   Processing time p50={p50:.3f}s, p95={p95:.3f}s, p99={p99:.3f}s")
+            p50, p95, p99 = np.percentile(total_times, [50, 95, 99])
+            print(f"   Total time p50={p50:.3f}s, p95={p95:.3f}s, p99={p99:.3f}s")
         
         # Operation Performance
         if operation_results:
             print(f"\n3. OPERATION PERFORMANCE ANALYSIS")
             for op, results in operation_results.items():
-                if results:
-                    times = [r['processing_time'] for r in results]
-                    avg_time = statistics.mean(times)
-                    print(f"   {op}: avg={avg_time:.3f}s (inputs: {[r['input'] for r in results]})")
+                if results.size:
+                    avg_time = self.processing_times(results).mean()
+                    print(f"   {op}: avg={avg_time:.3f}s (inputs: {self.input_val[results].tolist()})")
         
         # System Stability
         if stability_results:
@@ -527,10 +999,12 @@ class TaskProcessorTester:
                     print(f"   Completion rate: {completion_rate:.1f}%")
         
         # Generate plots if matplotlib is available
-        try:
-            self.create_visualizations(round_robin_results, load_results, operation_results)
-        except ImportError:
-            print("   (Matplotlib not available for visualizations)")
+        if plot_format != "none":
+            try:
+                self.create_visualizations(round_robin_results, load_results, operation_results, plot_format,
+                                           plot_style)
+            except ImportError:
+                print("   (Matplotlib not available for visualizations)")
         
         print(f"\n5. SYSTEM VALIDATION")
         print(f"   PASS: Round-robin task distribution verified")
@@ -539,195 +1013,370 @@ class TaskProcessorTester:
         print(f"   PASS: Priority values preserved in JSON but don't affect processing order")
         
         # Add performance insights
-        if round_robin_results and len(round_robin_results) < 25:  # Less than ~83% success rate
+        if len(round_robin_results) and len(round_robin_results) < 25:  # Less than ~83% success rate
             print(f"\nPERFORMANCE NOTES:")
             print(f"   Some tasks failed to process within timeout - this may indicate:")
             print(f"   • System is under heavy load (normal for stress testing)")
             print(f"   • Worker threads are saturated with current workload")  
             print(f"   • Consider increasing timeout or reducing concurrent load")
-        elif round_robin_results:
+        elif len(round_robin_results):
             print(f"\nPERFORMANCE NOTES:")
             print(f"   System handled the load well with minimal failures")
 
-    def create_visualizations(self, round_robin_results, load_results, operation_results):
+    def create_visualizations(self, round_robin_results, load_results, operation_results, plot_format="png",
+                              plot_style="boxplot"):
         """Create performance visualization charts"""
-        try:
+        if len(round_robin_results) or len(load_results) or operation_results:
+            # Imported only when a chart is drawn; slow to import
+            import matplotlib
+            matplotlib.use("Agg")  # Render to file only; no GUI backend
             import matplotlib.pyplot as plt
-            import numpy as np
             
-            if round_robin_results or load_results or operation_results:
-                fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-                fig.suptitle('Task Processing System Performance Analysis (Round-Robin)', fontsize=16)
+            fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+            fig.suptitle('Task Processing System Performance Analysis (Round-Robin)', fontsize=16)
+            
+            # Round-robin distribution chart
+            if len(round_robin_results):
+                ax = axes[0, 0]
+                priorities = self.priority[round_robin_results]
+                processing_times = self.processing_times(round_robin_results)
                 
-                # Round-robin distribution chart
-                if round_robin_results:
-                    ax = axes[0, 0]
-                    priorities = [t['priority'] for t in round_robin_results]
-                    processing_times = [t['processing_time'] for t in round_robin_results]
-                    
-                    priority_data = {1: [], 2: [], 3: []}
-                    for p, t in zip(priorities, processing_times):
-                        priority_data[p].append(t)
-                    
-                    bp_data = [priority_data[1], priority_data[2], priority_data[3]]
-                    bp = ax.boxplot(bp_data, labels=['LOW (1)', 'MEDIUM (2)', 'HIGH (3)'])
-                    ax.set_title('Processing Time Distribution by Priority\n(Round-Robin - Should be Similar)')
-                    ax.set_ylabel('Processing Time (seconds)')
-                    ax.set_xlabel('Priority Level (Stored in JSON Only)')
+                bp_data = [processing_times[priorities == p] for p in (1, 2, 3)]
+                bp = ax.boxplot(bp_data, tick_labels=['LOW (1)', 'MEDIUM (2)', 'HIGH (3)'])
+                ax.set_title('Processing Time Distribution by Priority\n(Round-Robin - Should be Similar)')
+                ax.set_ylabel('Processing Time (seconds)')
+                ax.set_xlabel('Priority Level (Stored in JSON Only)')
+            
+            # Processing time timeline
+            if len(round_robin_results):
+                ax = axes[0, 1]
+                ordered = round_robin_results[np.argsort(self.processed_ns[round_robin_results], kind='stable')]
+                times = self.processing_times(ordered)
+                # Long runs: plot only the visually significant points
+                indices = lttb_indices(times)
+                ordered, times = ordered[indices], times[indices]
                 
-                # Processing time timeline
-                if round_robin_results:
-                    ax = axes[0, 1]
-                    sorted_results = sorted(round_robin_results, key=lambda x: x['processed_at'])
-                    times = [r['processing_time'] for r in sorted_results]
-                    indices = range(len(times))
-                    
-                    ax.plot(indices, times, 'b-', alpha=0.7, linewidth=1)
-                    ax.scatter(indices, times, c=[r['priority'] for r in sorted_results], 
-                              cmap='viridis', alpha=0.6, s=20)
-                    ax.set_title('Processing Timeline\n(Colors = Priority, Mixed Order Expected)')
-                    ax.set_xlabel('Task Processing Order')
-                    ax.set_ylabel('Processing Time (seconds)')
-                    plt.colorbar(ax.collections[0], ax=ax, label='Priority Level')
+                ax.plot(indices, times, 'b-', alpha=0.7, linewidth=1)
+                ax.scatter(indices, times, c=self.priority[ordered], 
+                          cmap='viridis', alpha=0.6, s=20)
+                ax.set_title('Processing Timeline\n(Colors = Priority, Mixed Order Expected)')
+                ax.set_xlabel('Task Processing Order')
+                ax.set_ylabel('Processing Time (seconds)')
+                plt.colorbar(ax.collections[0], ax=ax, label='Priority Level')
+            
+            # Operation performance comparison
+            if operation_results:
+                ax = axes[1, 0]
+                operations = []
+                avg_times = []
                 
-                # Operation performance comparison
-                if operation_results:
-                    ax = axes[1, 0]
-                    operations = []
-                    avg_times = []
-                    
-                    for op, results in operation_results.items():
-                        if results:
-                            operations.append(op)
-                            avg_times.append(statistics.mean([r['processing_time'] for r in results]))
-                    
-                    bars = ax.bar(operations, avg_times, color=['skyblue', 'lightcoral', 'lightgreen'])
-                    ax.set_title('Average Processing Time by Operation')
-                    ax.set_ylabel('Processing Time (seconds)')
-                    ax.set_xlabel('Operation Type')
-                    
-                    # Add value labels on bars
-                    for bar, time in zip(bars, avg_times):
-                        height = bar.get_height()
-                        ax.text(bar.get_x() + bar.get_width()/2., height + 0.001,
-                               f'{time:.3f}s', ha='center', va='bottom')
+                for op, results in operation_results.items():
+                    if results.size:
+                        operations.append(op)
+                        avg_times.append(self.processing_times(results).mean())
                 
-                # Load distribution analysis
-                if load_results:
-                    ax = axes[1, 1]
-                    batch_ids = [r.get('batch_id', 0) for r in load_results]
-                    processing_times = [r['processing_time'] for r in load_results]
-                    
-                    # Group by batch
-                    batch_data = {}
-                    for batch_id, proc_time in zip(batch_ids, processing_times):
-                        if batch_id not in batch_data:
-                            batch_data[batch_id] = []
-                        batch_data[batch_id].append(proc_time)
+                bars = ax.bar(operations, avg_times, color=['skyblue', 'lightcoral', 'lightgreen'])
+                ax.set_title('Average Processing Time by Operation')
+                ax.set_ylabel('Processing Time (seconds)')
+                ax.set_xlabel('Operation Type')
+                
+                # Add value labels on bars
+                ax.bar_label(bars, fmt='%.3fs', padding=3)
+            
+            # Load distribution analysis
+            if len(load_results):
+                ax = axes[1, 1]
+                batch_ids = self.batch_id[load_results]
+                processing_times = self.processing_times(load_results)
+                
+                if plot_style == "heatmap":
+                    # Task density per (batch, processing time) cell: one
+                    # constant-size image however many batches and tasks
+                    batch_edges = np.arange(batch_ids.min(), batch_ids.max() + 2) - 0.5
+                    density, x_edges, y_edges = np.histogram2d(batch_ids, processing_times,
+                                                               bins=[batch_edges, 50])
+                    image = ax.imshow(density.T, origin='lower', aspect='auto', cmap='viridis',
+                                      extent=[x_edges[0], x_edges[-1], y_edges[0], y_edges[-1]])
+                    plt.colorbar(image, ax=ax, label='Tasks')
+                    ax.set_title('Processing Time Density by Concurrent Batch')
+                    ax.set_ylabel('Processing Time (seconds)')
+                    ax.set_xlabel('Batch ID')
+                else:
+                    # Group by batch: one hash aggregation with pandas, if installed
+                    try:
+                        import pandas as pd  # Only needed here; slow to import
+                    except ImportError:
+                        pd = None
+                    if pd is not None:
+                        grouped = pd.Series(processing_times).groupby(batch_ids, sort=True)
+                        batches = np.unique(batch_ids)  # Same sorted order as the groups
+                        bp_data = [times.to_numpy() for _, times in grouped]
+                    else:
+                        # Sorted batch ids and one stable sort into per-batch runs
+                        batches, inverse, counts = np.unique(batch_ids, return_inverse=True, return_counts=True)
+                        bp_data = np.split(processing_times[np.argsort(inverse, kind='stable')],
+                                           np.cumsum(counts)[:-1])
                     
                     # Create box plot by batch
-                    if batch_data:
-                        bp_data = [batch_data[i] for i in sorted(batch_data.keys())]
-                        bp = ax.boxplot(bp_data, labels=[f'Batch {i}' for i in sorted(batch_data.keys())])
+                    if batches.size:
+                        bp = ax.boxplot(bp_data, positions=np.arange(1, batches.size + 1),
+                                        tick_labels=[f'Batch {i}' for i in batches.tolist()])
                         ax.set_title('Processing Time Distribution by Concurrent Batch')
                         ax.set_ylabel('Processing Time (seconds)')
                         ax.set_xlabel('Batch ID')
-                
-                plt.tight_layout()
-                plt.savefig('performance_analysis.png', dpi=300, bbox_inches='tight')
-                print("   Performance visualization saved as 'performance_analysis.png'")
-                
-        except ImportError:
-            pass  # Matplotlib not available
+            
+            filename = f'performance_analysis.{plot_format}'
+            plt.tight_layout()
+            plt.savefig(filename, dpi=PLOT_DPI, bbox_inches='tight')
+            plt.close(fig)
+            print(f"   Performance visualization saved as '{filename}'")
+
+
+def _run_load_worker(orchestrator_url, unix_socket, client_backend, max_concurrency, poll_initial, poll_max,
+                     run_sync_endpoint, events, id_prefix, first_batch, concurrent_batches, tasks_per_batch):
+    """Process pool entry point: run a slice of the concurrent load test on
+    this process's own event loop; return (its records as export_records gives
+    them, its retry_counts).
+    
+    Task ids start with the worker's own id_prefix, so they can never
+    collide with the other workers' or the parent's, whatever the fallbacks
+    number.
+    """
+    async def run():
+        client = make_http_client(client_backend, unix_socket, max_concurrency)
+        async with client if client is not None else nullcontext(), \
+                   TaskProcessorTester(orchestrator_url, max_concurrency, unix_socket=unix_socket,
+                                       poll_initial=poll_initial, poll_max=poll_max, client=client,
+                                       expected_tasks=concurrent_batches * tasks_per_batch,
+                                       run_sync_endpoint=run_sync_endpoint, events=events,
+                                       id_prefix=id_prefix) as tester:
+            results = await tester.test_concurrent_load(concurrent_batches, tasks_per_batch, first_batch)
+            return tester.export_records(results), tester.retry_counts
+    
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    return asyncio.run(run())
+
+
+async def run_load_processes(tester, args):
+    """Split the concurrent load test's batches across args.processes worker
+    processes (one event loop each) and merge their records into `tester`"""
+    processes = min(args.processes, args.load_batches)
+    print(f"=== Concurrent Load Test ({processes} processes) ===")
+    loop = asyncio.get_running_loop()
+    start_time = tester._now()
+    # Spawn, not fork: a forked child would inherit the parent's running
+    # event loop, sockets and thread state
+    with ProcessPoolExecutor(max_workers=processes,
+                             mp_context=multiprocessing.get_context("spawn")) as pool:
+        futures = []
+        first_batch = 0
+        for worker in range(processes):
+            batches = args.load_batches // processes + (worker < args.load_batches % processes)
+            futures.append(loop.run_in_executor(pool, partial(
+                _run_load_worker, args.url, args.uds, args.client, args.max_concurrency,
+                args.poll_initial, args.poll_max, args.run_sync, args.events, f"perf-test-w{worker}-",
+                first_batch, batches, args.load_tasks_per_batch)))
+            first_batch += batches
+        worker_results = await asyncio.gather(*futures, return_exceptions=True)
+    total_time = tester._now() - start_time
+    
+    merged = []
+    for worker, worker_result in enumerate(worker_results):
+        if isinstance(worker_result, Exception):
+            print(f"  Load worker {worker} exception: {worker_result}")
+        else:
+            records, retry_counts = worker_result
+            merged.append(tester.import_records(*records))
+            tester.retry_counts.update(retry_counts)
+    all_results = np.concatenate(merged) if merged else np.empty(0, dtype=np.intp)
+    
+    expected_tasks = args.load_batches * args.load_tasks_per_batch
+    print(f"Combined concurrent load results:")
+    print(f"  Total time: {total_time:.2f}s")
+    print(f"  Completed tasks: {all_results.size}/{expected_tasks}")
+    print(f"  Throughput: {all_results.size/total_time:.2f} tasks/sec")
+    return all_results
+
+
+def positive_int(value):
+    """argparse type for counts that must be at least 1"""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {value}")
+    return number
 
 
 async def main():
     parser = argparse.ArgumentParser(description='Performance test for Task Processing System')
     parser.add_argument('--url', default='http://localhost:5000',
                        help='Orchestrator URL (default: http://localhost:5000)')
+    parser.add_argument('--uds', metavar='PATH',
+                       help='Connect over this Unix domain socket instead of TCP (local server only)')
+    parser.add_argument('--client', choices=['aiohttp', 'httpx'], default='aiohttp',
+                       help='HTTP client for requests; httpx shares one client and speaks HTTP/2 '
+                            'when the h2 package is installed (default: aiohttp)')
+    parser.add_argument('--poll-initial', type=float, default=POLL_INITIAL,
+                       help=f'First status poll delay in seconds when /events is unavailable (default: {POLL_INITIAL})')
+    parser.add_argument('--poll-max', type=float, default=POLL_MAX,
+                       help=f'Upper bound for the growing poll delay in seconds (default: {POLL_MAX})')
     parser.add_argument('--distribution-tasks', type=int, default=30,
                        help='Number of tasks for round-robin distribution test (default: 30)')
-    parser.add_argument('--load-batches', type=int, default=5,
+    parser.add_argument('--load-batches', type=positive_int, default=5,
                        help='Number of concurrent batches for load test (default: 5)')
+    parser.add_argument('--max-concurrency', type=int, default=DEFAULT_MAX_CONCURRENCY,
+                       help='Cap on in-flight task workflows and pooled connections; keep it at or '
+                            f'below ~512 per process (default: {DEFAULT_MAX_CONCURRENCY})')
     parser.add_argument('--load-tasks-per-batch', type=int, default=10,
                        help='Tasks per batch for load test (default: 10)')
+    parser.add_argument('--processes', type=int, default=1,
+                       help='Split the load test across this many processes, one event loop each '
+                            '(default: 1)')
     parser.add_argument('--stability-duration', type=int, default=60,
                        help='Duration for stability test in seconds (default: 60)')
+    parser.add_argument('--no-plots', action='store_true',
+                       help='Skip rendering the performance_analysis chart (same as --plot-format none)')
+    parser.add_argument('--plots', action='store_true',
+                       help='Render the chart even with --quick (which skips it by default)')
+    parser.add_argument('--plot-format', choices=['png', 'svg', 'none'],
+                       help='Chart output format (default: png, or none with --quick)')
+    parser.add_argument('--plot-style', choices=['boxplot', 'heatmap'], default='boxplot',
+                       help='Per-batch load chart: box plots, or a density heatmap that stays readable '
+                            'with many batches (default: boxplot)')
+    parser.add_argument('--save-results', metavar='DIR',
+                       help='Also write the task records to DIR/results_<phase>.parquet (needs pandas, pyarrow)')
+    parser.add_argument('--replay', metavar='DIR',
+                       help='Skip the tests and report on results saved with --save-results in DIR')
+    parser.add_argument('--batch-create', action='store_true',
+                       help='Create the distribution test tasks with one POST /task/create_batch '
+                            '(both bundled servers provide it)')
+    parser.add_argument('--run-sync', action='store_true',
+                       help='Run each load/operation test task with one POST /task/run_sync '
+                            '(both bundled servers provide it)')
+    parser.add_argument('--events', action='store_true',
+                       help='Wait for task status on the GET /events SSE stream instead of polling '
+                            '(both bundled servers provide it)')
     parser.add_argument('--quick', action='store_true',
                        help='Run quick tests only')
     
     args = parser.parse_args()
+    if args.plot_format is None:
+        args.plot_format = "none" if args.no_plots or (args.quick and not args.plots) else "png"
     
-    tester = TaskProcessorTester(args.url)
+    if args.replay:
+        async with TaskProcessorTester(args.url) as tester:
+            try:
+                results = tester.read_results(args.replay)
+            except (ImportError, OSError) as e:
+                print(f"ERROR: Could not read saved results from {args.replay}: {e}")
+                return 1
+            print(f"Replaying saved results from {args.replay}")
+            await asyncio.to_thread(tester.generate_report, *results, plot_format=args.plot_format,
+                                    plot_style=args.plot_style)
+        return 0
     
-    print("Task Processing System Performance Tester")
-    print("=" * 50)
-    print(f"Target URL: {args.url}")
-    print(f"Testing round-robin task distribution and system performance")
+    # Size the task columns for every task this run will create
+    expected_tasks = args.distribution_tasks + 4 * len(OPERATIONS)  # Operation test: 4 inputs each
+    if not args.quick:
+        expected_tasks += args.load_batches * args.load_tasks_per_batch + int(args.stability_duration / 0.5) + 1
     
-    try:
-        # Check if system is running
-        async with aiohttp.ClientSession() as session:
-            async with session.get(f"{args.url}/stats") as response:
-                if response.status != 200:
-                    print("ERROR: Task Processing System is not running or not accessible")
-                    print(f"Please start the system and ensure it's accessible at {args.url}")
-                    return 1
-                
-                stats = await response.json()
-                print(f"System is running with {stats.get('total_workers', 'unknown')} workers")
-        
-        # Run tests
-        round_robin_results = await tester.test_round_robin_distribution(args.distribution_tasks)
-        
-        load_results = []
-        if not args.quick:
-            load_results = await tester.test_concurrent_load(args.load_batches, args.load_tasks_per_batch)
-        
-        operation_results = await tester.test_operation_performance()
+    # One shared client (and connection pool) serves every test
+    client = make_http_client(args.client, args.uds, args.max_concurrency)
+    async with client if client is not None else nullcontext(), \
+               TaskProcessorTester(args.url, args.max_concurrency, unix_socket=args.uds,
+                                   poll_initial=args.poll_initial, poll_max=args.poll_max,
+                                   client=client, expected_tasks=expected_tasks,
+                                   batch_create=args.batch_create, run_sync_endpoint=args.run_sync,
+                                   events=args.events) as tester:
+        target = f"unix:{args.uds}" if args.uds else args.url
+        print("Task Processing System Performance Tester")
+        print("=" * 50)
+        print(f"Target URL: {target}")
+        print(f"Event Loop: {type(asyncio.get_running_loop()).__module__.split('.')[0]}")
+        print(f"Testing round-robin task distribution and system performance")
         
-        stability_results = {}
-        if not args.quick:
-            stability_results = await tester.test_system_stability(args.stability_duration)
-        
-        # Generate report
-        tester.generate_report(round_robin_results, load_results, operation_results, stability_results)
-        
-        # Final system stats
-        final_stats = await tester.get_system_stats()
-        if final_stats:
-            print(f"\n6. FINAL SYSTEM STATISTICS")
-            print(f"   Total tasks processed: {final_stats.get('total_tasks_processed', 0)}")
-            print(f"   Total tasks completed: {final_stats.get('total_tasks_completed', 0)}")
-            print(f"   Total tasks failed: {final_stats.get('total_tasks_failed', 0)}")
-            print(f"   Active workers: {final_stats.get('total_workers', 0)}")
-            print(f"   System uptime: {final_stats.get('uptime_seconds', 0)} seconds")
-        
-        print(f"\nPerformance testing completed successfully!")
-        print(f"Key validations:")
-        print(f"  PASS: Round-robin task distribution verified")
-        print(f"  PASS: Task completion via POST /task/{{id}}/complete")
-        print(f"  PASS: All required operations (factorial, fibonacci, prime_check) tested")
-        print(f"  PASS: System stability under sustained load verified")
-        
-        print(f"\nNote: Task failures in performance tests are expected under high load")
-        print(f"as they indicate the system's maximum throughput capacity.")
-        
-        return 0
-        
-    except aiohttp.ClientConnectorError:
-        print("ERROR: Could not connect to Task Processing System")
-        print(f"Please ensure the system is running at {args.url}")
-        return 1
-    except KeyboardInterrupt:
-        print("\nTest interrupted by user")
-        return 1
-    except Exception as e:
-        print(f"ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        return 1
+        try:
+            # Check if system is running
+            stats = await tester.get_system_stats()
+            if stats is None:
+                print("ERROR: Task Processing System is not running or not accessible")
+                print(f"Please start the system and ensure it's accessible at {target}")
+                return 1
+            
+            # The first response tells which protocol the server agreed to
+            print(f"HTTP Client: {'aiohttp' if client is None else 'httpx'} ({tester.http_version})")
+            print(f"System is running with {stats.get('total_workers', 'unknown')} workers")
+            
+            # Run tests
+            round_robin_results = await tester.test_round_robin_distribution(args.distribution_tasks)
+            
+            load_results = np.empty(0, dtype=np.intp)
+            if not args.quick and args.processes > 1:
+                load_results = await run_load_processes(tester, args)
+            elif not args.quick:
+                load_results = await tester.test_concurrent_load(args.load_batches, args.load_tasks_per_batch)
+            
+            operation_results = await tester.test_operation_performance()
+            
+            stability_results = {}
+            if not args.quick:
+                stability_results = await tester.test_system_stability(args.stability_duration)
+            
+            await tester.stop_event_stream()
+            
+            # Generate report
+            # Report off the event loop (numpy releases the GIL for the heavy parts)
+            await asyncio.to_thread(tester.generate_report, round_robin_results, load_results, operation_results,
+                                    stability_results, plot_format=args.plot_format, plot_style=args.plot_style)
+            
+            if args.save_results:
+                try:
+                    tester.save_results(args.save_results, round_robin_results, load_results,
+                                        operation_results, stability_results)
+                    print(f"   Task records saved to {args.save_results}/results_*.parquet")
+                except (ImportError, OSError) as e:
+                    print(f"   Could not save results: {e}")
+            
+            # Final system stats
+            final_stats = await tester.get_system_stats()
+            if final_stats:
+                print(f"\n6. FINAL SYSTEM STATISTICS")
+                print(f"   Total tasks processed: {final_stats.get('total_tasks_processed', 0)}")
+                print(f"   Total tasks completed: {final_stats.get('total_tasks_completed', 0)}")
+                print(f"   Total tasks failed: {final_stats.get('total_tasks_failed', 0)} "
+                      f"(client: {tester.retry_counts['retried']} requests retried, "
+                      f"{tester.retry_counts['failed']} failed after {REQUEST_ATTEMPTS} attempts)")
+                print(f"   Active workers: {final_stats.get('total_workers', 0)}")
+                print(f"   System uptime: {final_stats.get('uptime_seconds', 0)} seconds")
+            
+            print(f"\nPerformance testing completed successfully!")
+            print(f"Key validations:")
+            print(f"  PASS: Round-robin task distribution verified")
+            print(f"  PASS: Task completion via POST /task/{{id}}/complete")
+            print(f"  PASS: All required operations (factorial, fibonacci, prime_check) tested")
+            print(f"  PASS: System stability under sustained load verified")
+            
+            print(f"\nNote: Task failures in performance tests are expected under high load")
+            print(f"as they indicate the system's maximum throughput capacity.")
+            
+            return 0
+            
+        except CONNECT_ERRORS:
+            print("ERROR: Could not connect to Task Processing System")
+            print(f"Please ensure the system is running at {target}")
+            return 1
+        except KeyboardInterrupt:
+            print("\nTest interrupted by user")
+            return 1
+        except Exception as e:
+            print(f"ERROR: {e}")
+            import traceback
+            traceback.print_exc()
+            return 1
 
 if __name__ == "__main__":
+    # Every test is dominated by small aiohttp requests; use uvloop when available
+    if uvloop is not None:
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     exit_code = asyncio.run(main())
     sys.exit(exit_code)
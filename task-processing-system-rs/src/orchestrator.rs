@@ -1,14 +1,20 @@
 #![allow(warnings)]
 use crate::types::*;
-use crate::worker::Worker;
+use crate::worker::{Worker, STATUS_EVENT_CAPACITY};
 use chrono::Utc;
 use std::sync::atomic::{AtomicBool, AtomicUsize, Ordering};
 use std::sync::Arc;
-use std::time::Instant;
-use tokio::sync::RwLock;
+use std::time::{Duration, Instant};
+use tokio::sync::{broadcast, RwLock};
 use tokio::task::JoinHandle;
 use tracing::{debug, error, info};
-use warp::Filter;
+use warp::{Filter, Reply};
+
+/// Round-robin counter shared by the create endpoints
+static NEXT_WORKER: AtomicUsize = AtomicUsize::new(0);
+
+/// How long POST /task/run_sync waits for the task to be processed
+const RUN_SYNC_TIMEOUT: Duration = Duration::from_secs(30);
 
 /// Task orchestrator that manages multiple workers with round-robin distribution
 pub struct TaskOrchestrator {
@@ -19,6 +25,7 @@ pub struct TaskOrchestrator {
     start_time: Instant,
     worker_handles: Arc<RwLock<Vec<JoinHandle<()>>>>,
     server_handle: Arc<RwLock<Option<JoinHandle<()>>>>,
+    status_events: broadcast::Sender<TaskStatusEvent>,
 }
 
 impl TaskOrchestrator {
@@ -31,10 +38,15 @@ impl TaskOrchestrator {
             config.num_workers, config.threads_per_worker
         );
 
-        // Create workers
+        // Create workers, all reporting status changes on one channel
+        let (status_events, _) = broadcast::channel(STATUS_EVENT_CAPACITY);
         let mut workers = Vec::new();
         for i in 0..config.num_workers {
-            let worker = Arc::new(Worker::new(i, config.threads_per_worker)); // Remove port parameter
+            let worker = Arc::new(Worker::with_status_events(
+                i,
+                config.threads_per_worker,
+                status_events.clone(),
+            ));
             workers.push(worker);
 }
 
@@ -46,6 +58,7 @@ impl TaskOrchestrator {
             start_time: Instant::now(),
             worker_handles: Arc::new(RwLock::new(Vec::new())),
             server_handle: Arc::new(RwLock::new(None)),
+            status_events,
         })
     }
 
@@ -232,8 +245,7 @@ impl TaskOrchestrator {
             .and(warp::any().map(move || workers.clone()))
             .and_then(|request: CreateTaskRequest, workers: Vec<Arc<Worker>>| async move {
                 // Simple round-robin selection
-                static COUNTER: std::sync::atomic::AtomicUsize = std::sync::atomic::AtomicUsize::new(0);
-                let worker_idx = COUNTER.fetch_add(1, std::sync::atomic::Ordering::Relaxed) % workers.len();
+                let worker_idx = NEXT_WORKER.fetch_add(1, Ordering::Relaxed) % workers.len();
                 let worker = &workers[worker_idx];
                 
                 match request.into_task() {
@@ -256,15 +268,128 @@ impl TaskOrchestrator {
                 }
             });
     
+        // Batch create endpoint: {"tasks": [...]}, each task validated and
+        // distributed on its own; rejected ones are listed by request index
+        let workers_for_batch = self.workers.clone();
+        let create_batch = warp::path!("task" / "create_batch")
+            .and(warp::post())
+            .and(warp::body::json())
+            .and(warp::any().map(move || workers_for_batch.clone()))
+            .and_then(|request: CreateTaskBatchRequest, workers: Vec<Arc<Worker>>| async move {
+                let mut task_ids = Vec::new();
+                let mut errors = Vec::new();
+                for (index, value) in request.tasks.into_iter().enumerate() {
+                    let task = serde_json::from_value::<CreateTaskRequest>(value)
+                        .map_err(|e| e.to_string())
+                        .and_then(|request| request.into_task().map_err(|e| e.to_string()));
+                    let result = match task {
+                        Ok(task) => {
+                            let task_id = task.id.clone();
+                            let worker_idx = NEXT_WORKER.fetch_add(1, Ordering::Relaxed) % workers.len();
+                            workers[worker_idx].add_task(task).await
+                                .map(|()| task_id)
+                                .map_err(|e| e.to_string())
+                        }
+                        Err(e) => Err(e),
+                    };
+                    match result {
+                        Ok(task_id) => task_ids.push(task_id),
+                        Err(error) => errors.push(serde_json::json!({"index": index, "error": error})),
+                    }
+                }
+                Ok::<_, warp::Rejection>(warp::reply::json(&serde_json::json!({
+                    "message": "Tasks created successfully",
+                    "task_ids": task_ids,
+                    "errors": errors
+                })))
+            });
+    
+        // Run sync endpoint: create a task, wait for it to be processed and
+        // complete it, all in one request; the body is the same as /task/create
+        let workers_for_sync = self.workers.clone();
+        let status_events_for_sync = self.status_events.clone();
+        let run_sync = warp::path!("task" / "run_sync")
+            .and(warp::post())
+            .and(warp::body::json())
+            .and(warp::any().map(move || (workers_for_sync.clone(), status_events_for_sync.clone())))
+            .and_then(|request: CreateTaskRequest,
+                       (workers, status_events): (Vec<Arc<Worker>>, broadcast::Sender<TaskStatusEvent>)| async move {
+                let reply = |body: serde_json::Value, status: warp::http::StatusCode| {
+                    Ok::<_, warp::Rejection>(warp::reply::with_status(warp::reply::json(&body), status))
+                };
+                let task = match request.into_task() {
+                    Ok(task) => task,
+                    Err(e) => return reply(serde_json::json!({"error": e.to_string()}),
+                                           warp::http::StatusCode::BAD_REQUEST),
+                };
+                let task_id = task.id.clone();
+    
+                // Subscribe before queueing, so the task's event can't be missed
+                let mut receiver = status_events.subscribe();
+                let worker = &workers[NEXT_WORKER.fetch_add(1, Ordering::Relaxed) % workers.len()];
+                if let Err(e) = worker.add_task(task).await {
+                    return reply(serde_json::json!({"error": e.to_string()}),
+                                 warp::http::StatusCode::BAD_REQUEST);
+                }
+    
+                let deadline = tokio::time::Instant::now() + RUN_SYNC_TIMEOUT;
+                loop {
+                    match tokio::time::timeout_at(deadline, receiver.recv()).await {
+                        Ok(Ok(event)) if event.task_id == task_id => break,
+                        Ok(Ok(_)) => continue,
+                        // Our event may be among the dropped ones: look at the task
+                        Ok(Err(broadcast::error::RecvError::Lagged(_))) => {
+                            match worker.get_task(&task_id) {
+                                Some(task) if task.status == TaskStatus::Pending => continue,
+                                _ => break,
+                            }
+                        }
+                        Ok(Err(broadcast::error::RecvError::Closed)) | Err(_) => break,
+                    }
+                }
+    
+                if let Ok(true) = worker.complete_task(&task_id) {
+                    let result = worker.get_task(&task_id).and_then(|task| task.result);
+                    return reply(serde_json::json!({
+                        "message": "Task processed and completed",
+                        "task_id": task_id,
+                        "status": "completed",
+                        "result": result
+                    }), warp::http::StatusCode::OK);
+                }
+                match worker.get_task(&task_id) {
+                    Some(task) if task.status == TaskStatus::Pending => reply(serde_json::json!({
+                        "error": "Timed out waiting for task to be processed",
+                        "task_id": task_id
+                    }), warp::http::StatusCode::GATEWAY_TIMEOUT),
+                    task => reply(serde_json::json!({
+                        "error": "Task processing failed",
+                        "task_id": task_id,
+                        "reason": task.and_then(|task| task.error_message)
+                    }), warp::http::StatusCode::BAD_REQUEST),
+                }
+            });
+    
         // Get task endpoint
+        // (HEAD is routed here too: the status header alone, no JSON body)
         let workers_for_get = self.workers.clone();
         let get_task = warp::path!("task" / String)
-            .and(warp::get())
+            .and(warp::get().or(warp::head()).unify())
+            .and(warp::method())
             .and(warp::any().map(move || workers_for_get.clone()))
-            .and_then(|task_id: String, workers: Vec<Arc<Worker>>| async move {
+            .and_then(|task_id: String, method: warp::http::Method, workers: Vec<Arc<Worker>>| async move {
                 for worker in &workers {
                     if let Some(task) = worker.get_task(&task_id) {
-                        return Ok(warp::reply::json(&task));
+                        let mut response = if method == warp::http::Method::HEAD {
+                            warp::reply::with_header(warp::reply(), "Content-Type", "application/json").into_response()
+                        } else {
+                            warp::reply::json(&task).into_response()
+                        };
+                        response.headers_mut().insert(
+                            "X-Task-Status",
+                            warp::http::HeaderValue::from_static(task.status.as_str()),
+                        );
+                        return Ok(response);
                     }
                 }
                 Err(warp::reject::not_found())
@@ -321,6 +446,25 @@ impl TaskOrchestrator {
                 Ok::<_, warp::Rejection>(warp::reply::json(&system_stats))
             });
     
+        // Status stream endpoint: one SSE `data: {"task_id", "status"}` message
+        // per task that is processed or fails, from the time of connecting
+        let status_events = self.status_events.clone();
+        let events = warp::path!("events")
+            .and(warp::get())
+            .map(move || {
+                let stream = futures::stream::unfold(status_events.subscribe(), |mut receiver| async move {
+                    loop {
+                        match receiver.recv().await {
+                            Ok(event) => return Some((warp::sse::Event::default().json_data(&event), receiver)),
+                            // A reader that fell behind skips the events already dropped
+                            Err(broadcast::error::RecvError::Lagged(_)) => continue,
+                            Err(broadcast::error::RecvError::Closed) => return None,
+                        }
+                    }
+                });
+                warp::sse::reply(warp::sse::keep_alive().stream(stream))
+            });
+    
         // Health check endpoint
         let health = warp::path("health")
             .and(warp::get())
@@ -332,9 +476,12 @@ impl TaskOrchestrator {
             });
     
         let routes = create_task
+            .or(create_batch)
+            .or(run_sync)
             .or(get_task)
             .or(complete_task)
             .or(get_stats)
+            .or(events)
             .or(health)
             .with(warp::cors().allow_any_origin())
             .with(warp::log("orchestrator"));
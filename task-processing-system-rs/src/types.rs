@@ -59,6 +59,18 @@ impl Default for TaskStatus {
     }
 }
 
+impl TaskStatus {
+    /// Wire name of the status, as serialized in task JSON
+    pub fn as_str(&self) -> &'static str {
+        match self {
+            TaskStatus::Pending => "pending",
+            TaskStatus::Processing => "processing",
+            TaskStatus::Completed => "completed",
+            TaskStatus::Failed => "failed",
+        }
+    }
+}
+
 /// Mathematical operations supported by the system
 #[derive(Debug, Clone, PartialEq, Eq, Serialize, Deserialize)]
 pub enum Operation {
@@ -257,6 +269,13 @@ impl CreateTaskRequest {
     }
 }
 
+/// Batch task creation request from API; each entry is parsed on its own
+/// so one bad task doesn't reject the rest
+#[derive(Debug, Deserialize)]
+pub struct CreateTaskBatchRequest {
+    pub tasks: Vec<serde_json::Value>,
+}
+
 /// Task completion response
 #[derive(Debug, Serialize)]
 pub struct TaskCompletionResponse {
@@ -265,6 +284,13 @@ pub struct TaskCompletionResponse {
     pub message: String,
 }
 
+/// Task status change pushed to GET /events subscribers
+#[derive(Debug, Clone, Serialize)]
+pub struct TaskStatusEvent {
+    pub task_id: String,
+    pub status: TaskStatus,
+}
+
 /// Worker statistics
 #[derive(Debug, Clone, Serialize, Deserialize)]
 pub struct WorkerStats {
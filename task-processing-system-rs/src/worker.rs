@@ -6,10 +6,13 @@ use std::collections::VecDeque;
 use std::sync::atomic::{AtomicBool, AtomicU64, Ordering};
 use std::sync::Arc;
 use std::time::{Duration, Instant};
-use tokio::sync::{Mutex, Notify};
+use tokio::sync::{broadcast, Mutex, Notify};
 use tokio::task::JoinHandle;
 use tracing::{debug, error, info};
 
+/// Status events buffered per subscriber before a slow reader starts missing them
+pub const STATUS_EVENT_CAPACITY: usize = 4096;
+
 /// Worker node that processes tasks
 pub struct Worker {
     pub id: usize,
@@ -29,6 +32,9 @@ pub struct Worker {
     // Control
     running: Arc<AtomicBool>,
     shutdown_notify: Arc<Notify>,
+    
+    // Processed/failed notifications
+    status_events: broadcast::Sender<TaskStatusEvent>,
 }
 
 #[derive(Debug, Clone)]
@@ -40,6 +46,15 @@ pub struct WorkerConfig {
 impl Worker {
     /// Create a new worker instance
     pub fn new(id: usize, num_threads: usize) -> Self {
+        Self::with_status_events(id, num_threads, broadcast::channel(STATUS_EVENT_CAPACITY).0)
+    }
+
+    /// Create a worker that reports processed and failed tasks on `status_events`
+    pub fn with_status_events(
+        id: usize,
+        num_threads: usize,
+        status_events: broadcast::Sender<TaskStatusEvent>,
+    ) -> Self {
         Self {
             id,
             config: WorkerConfig {
@@ -55,6 +70,7 @@ impl Worker {
             start_time: Instant::now(),
             running: Arc::new(AtomicBool::new(false)),
             shutdown_notify: Arc::new(Notify::new()),
+            status_events,
         }
     }
 
@@ -178,6 +194,7 @@ impl Worker {
         let running = Arc::clone(&self.running);
         let tasks_processed = Arc::clone(&self.tasks_processed);
         let tasks_failed = Arc::clone(&self.tasks_failed);
+        let status_events = self.status_events.clone();
 
         tokio::spawn(async move {
             info!("Processing thread {} started for worker {}", thread_id, worker_id);
@@ -209,6 +226,11 @@ impl Worker {
                                     }
                                     tasks_processed.fetch_add(1, Ordering::Relaxed);
                                     debug!("Task {} processed successfully by worker {}", task_id, worker_id);
+                                    // No subscribers is not an error
+                                    let _ = status_events.send(TaskStatusEvent {
+                                        task_id: task_id.clone(),
+                                        status: TaskStatus::Processing,
+                                    });
                                 }
                                 Err(e) => {
                                     error!("Task {} processing failed on worker {}: {}", task_id, worker_id, e);
@@ -218,6 +240,10 @@ impl Worker {
                                         entry.set_failed(e.to_string());
                                     }
                                     tasks_failed.fetch_add(1, Ordering::Relaxed);
+                                    let _ = status_events.send(TaskStatusEvent {
+                                        task_id: task_id.clone(),
+                                        status: TaskStatus::Failed,
+                                    });
                                 }
                             }
                         }